@@ -43,6 +43,23 @@ fi
 ENABLE_NOVNC="$PLATFORM_NOVNC"
 export ENABLE_NOVNC
 
+# Remote desktop resource profile: "always" keeps x11vnc/noVNC running, "on_demand"
+# starts them when a client hits /websockify and stops them after an idle timeout.
+DISPLAY_MODE=$(jq -r '.display_mode // "always"' "$PLATFORM_SETTINGS_PATH" 2>/dev/null)
+# Without noVNC there is no VNC stack to start on demand.
+if [ "$DISPLAY_MODE" != "on_demand" ] || [ "$ENABLE_NOVNC" != "true" ]; then
+    DISPLAY_MODE="always"
+fi
+DISPLAY_IDLE_TIMEOUT=$(jq -r '.display_idle_timeout // 300' "$PLATFORM_SETTINGS_PATH" 2>/dev/null)
+if ! [[ "$DISPLAY_IDLE_TIMEOUT" =~ ^[0-9]+$ ]] || [ "$DISPLAY_IDLE_TIMEOUT" -lt 30 ]; then
+    DISPLAY_IDLE_TIMEOUT=300
+fi
+DISPLAY_COLOR_DEPTH=$(jq -r '.display_color_depth // 24' "$PLATFORM_SETTINGS_PATH" 2>/dev/null)
+if [ "$DISPLAY_COLOR_DEPTH" != "16" ]; then
+    DISPLAY_COLOR_DEPTH=24
+fi
+export DISPLAY_MODE DISPLAY_IDLE_TIMEOUT DISPLAY_COLOR_DEPTH
+
 DEFAULT_WEBUI_USER=${WEBUI_USERNAME:-triplo}
 DEFAULT_WEBUI_PASS=${WEBUI_PASSWORD:-triplo}
 DEFAULT_NOVNC_USER=${NOVNC_USERNAME:-}
@@ -168,7 +185,7 @@ serverurl=unix:///var/run/supervisor.sock
 supervisor.rpcinterface_factory = supervisor.rpcinterface:make_main_rpcinterface
 
 [program:xvfb]
-command=/usr/bin/Xvfb :1 -screen 0 %(ENV_DISPLAY_WIDTH)sx%(ENV_DISPLAY_HEIGHT)sx24
+command=/usr/bin/Xvfb :1 -screen 0 %(ENV_DISPLAY_WIDTH)sx%(ENV_DISPLAY_HEIGHT)sx%(ENV_DISPLAY_COLOR_DEPTH)s
 autostart=true
 autorestart=true
 priority=100
@@ -220,7 +237,7 @@ stdout_logfile=/var/log/supervisor/triplo.log
 stderr_logfile=/var/log/supervisor/triplo_err.log
 
 [program:webui]
-command=/usr/local/bin/gunicorn -w 2 -b 0.0.0.0:5000 app:app
+command=/usr/local/bin/gunicorn -c /opt/webui/gunicorn.conf.py -b 0.0.0.0:5000 app:app
 directory=/opt/webui
 autostart=true
 autorestart=true
@@ -229,6 +246,24 @@ stdout_logfile=/var/log/supervisor/webui.log
 stderr_logfile=/var/log/supervisor/webui_err.log
 EOF
 
+    NOVNC_WAKE_INCLUDE=""
+    if [ "$DISPLAY_MODE" = "on_demand" ]; then
+        echo "💤 Remote desktop services start on demand (idle timeout ${DISPLAY_IDLE_TIMEOUT}s, ${DISPLAY_COLOR_DEPTH}-bit colour)"
+        sed -i '/^\[program:x11vnc\]/,/^$/ s/^autostart=true/autostart=false/; /^\[program:novnc\]/,/^$/ s/^autostart=true/autostart=false/' \
+            /etc/supervisor/conf.d/supervisord.conf
+        cat >> /etc/supervisor/conf.d/supervisord.conf << 'EOF'
+
+[program:display-idle]
+command=/usr/bin/python3 /opt/webui/display_stack.py watch --idle-timeout %(ENV_DISPLAY_IDLE_TIMEOUT)s --port 6081
+autostart=true
+autorestart=true
+priority=610
+stdout_logfile=/var/log/supervisor/display-idle.log
+stderr_logfile=/var/log/supervisor/display-idle_err.log
+EOF
+        printf -v NOVNC_WAKE_INCLUDE '            auth_request /_display_wake;\n'
+    fi
+
     # Configure nginx for noVNC + Web UI (with optional authentication)
     NOVNC_AUTH_INCLUDE=""
     NOVNC_AUTH_SNIPPET="/etc/nginx/snippets/novnc-auth.conf"
@@ -286,8 +321,16 @@ ${NOVNC_AUTH_INCLUDE}        }
             return 401 '<!DOCTYPE html><html lang="en"><head><meta charset="utf-8"><title>Logged out</title><meta http-equiv="refresh" content="0;url=/"></head><body style="font-family: -apple-system, BlinkMacSystemFont, Segoe UI, sans-serif; margin: 2rem;"><p>You have been signed out of the remote desktop. Redirecting...</p><script>setTimeout(function(){ window.location.replace("/"); }, 50);</script></body></html>';
         }
 
+        location = /_display_wake {
+            internal;
+            proxy_pass http://127.0.0.1:5000/internal/display/wake;
+            proxy_pass_request_body off;
+            proxy_set_header Content-Length "";
+            proxy_read_timeout 30s;
+        }
+
         location /websockify {
-            proxy_pass http://localhost:6081;
+${NOVNC_WAKE_INCLUDE}            proxy_pass http://localhost:6081;
             proxy_http_version 1.1;
             proxy_set_header Upgrade ${DOLLAR}http_upgrade;
             proxy_set_header Connection "upgrade";
@@ -299,6 +342,10 @@ ${NOVNC_AUTH_INCLUDE}        }
         listen 8080;
         server_name _;
 
+        location /internal/ {
+            return 404;
+        }
+
         location / {
             proxy_pass http://127.0.0.1:5000;
             proxy_set_header Host ${DOLLAR}host;
@@ -330,7 +377,7 @@ serverurl=unix:///var/run/supervisor.sock
 supervisor.rpcinterface_factory = supervisor.rpcinterface:make_main_rpcinterface
 
 [program:xvfb]
-command=/usr/bin/Xvfb :99 -screen 0 1920x1080x24
+command=/usr/bin/Xvfb :99 -screen 0 1920x1080x%(ENV_DISPLAY_COLOR_DEPTH)s
 autostart=true
 autorestart=true
 priority=100
@@ -348,7 +395,7 @@ stdout_logfile=/var/log/supervisor/triplo.log
 stderr_logfile=/var/log/supervisor/triplo_err.log
 
 [program:webui]
-command=/usr/local/bin/gunicorn -w 2 -b 0.0.0.0:8080 app:app
+command=/usr/local/bin/gunicorn -c /opt/webui/gunicorn.conf.py -b 0.0.0.0:8080 app:app
 directory=/opt/webui
 autostart=true
 autorestart=true
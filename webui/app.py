@@ -4,19 +4,30 @@ Triplo AI Web Configuration Interface
 Provides a web UI to configure Triplo settings and manage the application
 """
 
-from flask import Flask, render_template, jsonify, request, Response
+import time
+
+_IMPORT_STARTED = time.perf_counter()
+
+from flask import Flask, render_template, jsonify, request, Response, g
+import ipaddress
 import json
 import os
 import subprocess
 import signal
 import secrets
 import string
-import time
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Tuple, Optional
-from urllib import request as urlrequest, error as urlerror
 
+import auth_storage
 from auth_storage import load_auth_config as encrypted_load_auth, save_auth_config as encrypted_save_auth
+import display_stack
+import fleet
+from auth_throttle import FailedAuthThrottle
+from health import HealthMonitor
+from model_index import ModelIndex, ModelIndexCache, iter_model_items, model_entry
+import provider_bench
 
 app = Flask(__name__)
 
@@ -29,6 +40,18 @@ TRIPLO_PID_FILE = "/var/run/triplo.pid"
 NOVNC_PORT = os.environ.get("NOVNC_PORT", "6080")
 NOVNC_PUBLIC_URL = os.environ.get("NOVNC_PUBLIC_URL")
 SUPERVISOR_SERVER_URL = os.environ.get("SUPERVISOR_SERVER_URL", "unix:///var/run/supervisor.sock")
+AUTH_FAILURE_BURST = float(os.environ.get("WEBUI_AUTH_FAILURE_BURST", "10"))
+AUTH_FAILURE_REFILL_PER_SECOND = float(os.environ.get("WEBUI_AUTH_FAILURE_REFILL_PER_SECOND", "1"))
+# Proxies whose X-Forwarded-For entries are believed; the bundled nginx connects over loopback.
+TRUSTED_PROXIES = os.environ.get("WEBUI_TRUSTED_PROXIES", "127.0.0.0/8,::1/128")
+MODEL_INDEX_TTL = float(os.environ.get("WEBUI_MODEL_INDEX_TTL", "300"))
+MODEL_INDEX_MAX = int(os.environ.get("WEBUI_MODEL_INDEX_MAX", "8"))
+MODEL_SEARCH_MAX_LIMIT = 200
+PROVIDER_BENCHMARK_HISTORY_PATH = Path(os.environ.get(
+    "PROVIDER_BENCHMARK_HISTORY_FILE", Path.home() / ".config" / "Triplo AI" / "provider-benchmarks.json"))
+PROVIDER_BENCHMARK_TIMEOUT = float(os.environ.get("WEBUI_PROVIDER_BENCHMARK_TIMEOUT", "10"))
+# Keep a run inside gunicorn's default 30s worker timeout.
+PROVIDER_BENCHMARK_BUDGET = 25.0
 
 DEFAULT_AUTH = {
     "webui": {"username": "triplo", "password": "triplo"},
@@ -39,6 +62,27 @@ DEFAULT_AUTH = {
     }
 }
 
+_auth_throttle = FailedAuthThrottle(AUTH_FAILURE_BURST, AUTH_FAILURE_REFILL_PER_SECOND)
+_health_monitor = HealthMonitor()
+_model_indexes = ModelIndexCache(MODEL_INDEX_TTL, MODEL_INDEX_MAX)
+_fleet_client = fleet.PeerClient()
+_provider_history = provider_bench.BenchmarkHistory(
+    PROVIDER_BENCHMARK_HISTORY_PATH, int(os.environ.get("WEBUI_PROVIDER_BENCHMARK_HISTORY", "20")))
+# Routes answered without credentials (logout challenge and orchestration probes).
+PUBLIC_PATHS = {'/logout', '/healthz', '/readyz'}
+# Decrypted auth config keyed by the auth file's stat signature; see _load_auth_config.
+_auth_cache: Optional[Tuple[Tuple, Dict]] = None
+_startup = {
+    'pid': os.getpid(),
+    'preloaded': False,
+    'phases_ms': {},
+    'worker_started': None,
+    'first_response_ms': None,
+}
+# Whether the last decrypted auth config demanded credentials; lets requests without an
+# Authorization header be rejected without touching disk.
+_auth_enforced = False
+
 
 def _normalize_bool(value) -> bool:
     if isinstance(value, bool):
@@ -48,8 +92,9 @@ def _normalize_bool(value) -> bool:
     return bool(value)
 
 
-def _load_platform_settings() -> Dict[str, bool]:
+def _load_platform_settings() -> Dict:
     desired = os.environ.get("ENABLE_NOVNC", "false").strip().lower() == "true"
+    data = {}
     try:
         if PLATFORM_SETTINGS_PATH.exists():
             with open(PLATFORM_SETTINGS_PATH, "r", encoding="utf-8") as platform_file:
@@ -57,10 +102,24 @@ def _load_platform_settings() -> Dict[str, bool]:
                 desired = bool(data.get("novnc_enabled", desired))
     except (json.JSONDecodeError, OSError):
         desired = os.environ.get("ENABLE_NOVNC", "false").strip().lower() == "true"
-    return {"novnc_enabled": desired}
+        data = {}
+    if not isinstance(data, dict):
+        data = {}
+    settings = {"novnc_enabled": desired}
+    settings.update(display_stack.normalize_display_settings(data))
+    return settings
+
+
+def _active_display_settings() -> Dict:
+    """Display settings the running container was started with."""
+    return display_stack.normalize_display_settings({
+        "display_mode": os.environ.get("DISPLAY_MODE", "always"),
+        "display_idle_timeout": os.environ.get("DISPLAY_IDLE_TIMEOUT", 300),
+        "display_color_depth": os.environ.get("DISPLAY_COLOR_DEPTH", 24),
+    })
 
 
-def _save_platform_settings(settings: Dict[str, bool]) -> None:
+def _save_platform_settings(settings: Dict) -> None:
     PLATFORM_SETTINGS_PATH.parent.mkdir(parents=True, exist_ok=True)
     with open(PLATFORM_SETTINGS_PATH, "w", encoding="utf-8") as platform_file:
         json.dump(settings, platform_file, indent=2)
@@ -79,52 +138,83 @@ def _generate_llm_key() -> str:
     return "-".join(parts)
 
 
-def _request_json(url: str) -> Dict:
+def _normalize_provider_url(base_url: str) -> str:
+    cleaned = (base_url or "").strip()
+    if not cleaned:
+        raise ValueError("Missing Local LLM provider URL")
+    return cleaned.rstrip("/")
+
+
+def _stream_model_entries(url: str) -> list:
+    """Parse a model-list response entry by entry instead of buffering the whole body."""
+    from urllib import request as urlrequest  # pylint: disable=import-outside-toplevel
+
     req = urlrequest.Request(url, headers={"Accept": "application/json"})
     with urlrequest.urlopen(req, timeout=10) as response:
         charset = response.headers.get_content_charset() or "utf-8"
-        payload = response.read().decode(charset)
-        return json.loads(payload)
+        entries = []
+        for item in iter_model_items(response, charset):
+            entry = model_entry(item)
+            if entry:
+                entries.append(entry)
+        return entries
 
 
-def _fetch_local_llm_models(base_url: str) -> list:
-    cleaned = (base_url or "").strip()
-    if not cleaned:
-        raise ValueError("Missing Local LLM provider URL")
-    cleaned = cleaned.rstrip("/")
+def _build_model_index(base_url: str) -> ModelIndex:
+    from urllib import error as urlerror  # pylint: disable=import-outside-toplevel
+
+    cleaned = _normalize_provider_url(base_url)
     errors = []
     for suffix in ("/v1/models", "/api/tags"):
         endpoint = f"{cleaned}{suffix}"
         try:
-            payload = _request_json(endpoint)
-        except (urlerror.URLError, json.JSONDecodeError, ValueError) as exc:
+            entries = _stream_model_entries(endpoint)
+        except (urlerror.URLError, OSError, ValueError) as exc:
             errors.append(str(exc))
             continue
-        models = payload.get("models") or payload.get("data") or payload.get("result") or []
-        names = []
-        if isinstance(models, list):
-            for item in models:
-                if isinstance(item, str):
-                    names.append(item.strip())
-                elif isinstance(item, dict):
-                    candidate = item.get("name") or item.get("model") or item.get("id")
-                    if candidate:
-                        names.append(str(candidate).strip())
-        if names:
-            seen = []
-            for entry in names:
-                if entry and entry not in seen:
-                    seen.append(entry)
-            return seen
+        if entries:
+            return ModelIndex(entries, source=cleaned)
     raise RuntimeError("Unable to load Local LLM models from provider: " + "; ".join(errors))
 
 
+def _get_model_index(base_url: str, refresh: bool = False) -> ModelIndex:
+    """Return the cached catalog index for ``base_url``, fetching it when missing or stale."""
+    cleaned = _normalize_provider_url(base_url)
+    index = None if refresh else _model_indexes.get(cleaned)
+    if index is None:
+        index = _model_indexes.put(_build_model_index(cleaned))
+    return index
+
+
+def _fetch_local_llm_models(base_url: str) -> list:
+    return _get_model_index(base_url, refresh=True).names()
+
+
+def _auth_file_signature() -> Optional[Tuple]:
+    try:
+        stat = auth_storage.AUTH_CONFIG_PATH.stat()
+    except OSError:
+        return None
+    return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+
 def _load_auth_config() -> Dict:
-    """Return persisted auth configuration, falling back to defaults."""
+    """Return persisted auth configuration, falling back to defaults.
+
+    The decrypted result is reused until the auth file changes on disk.
+    """
+    global _auth_cache  # pylint: disable=global-statement
+    signature = _auth_file_signature()
+    cached = _auth_cache
+    if signature is not None and cached is not None and cached[0] == signature:
+        return json.loads(json.dumps(cached[1]))
+
     try:
         data = encrypted_load_auth(DEFAULT_AUTH)
+        loaded = True
     except Exception:  # pylint: disable=broad-except
         data = json.loads(json.dumps(DEFAULT_AUTH))
+        loaded = False
 
     data.setdefault("webui", {})
     data.setdefault("novnc", {})
@@ -133,15 +223,26 @@ def _load_auth_config() -> Dict:
     data["novnc"].setdefault("use_webui_credentials", True)
     data["novnc"].setdefault("username", data["webui"]["username"])
     data["novnc"].setdefault("password", data["webui"]["password"])
+    # Only cache when the file was not created, migrated or replaced while we read it.
+    if loaded and signature is not None and signature == _auth_file_signature():
+        _auth_cache = (signature, json.loads(json.dumps(data)))
     return data
 
 
 def _save_auth_config(config: Dict) -> None:
     encrypted_save_auth(config)
+    g.pop("auth_config", None)
+
+
+def _request_auth_config() -> Dict:
+    """Return the auth configuration, decrypting it at most once per request."""
+    if "auth_config" not in g:
+        g.auth_config = _load_auth_config()
+    return g.auth_config
 
 
-def _get_webui_credentials() -> Tuple[str, str]:
-    auth = _load_auth_config()
+def _get_webui_credentials(auth_config: Optional[Dict] = None) -> Tuple[str, str]:
+    auth = auth_config or _load_auth_config()
     return auth["webui"].get("username", ""), auth["webui"].get("password", "")
 
 
@@ -196,6 +297,84 @@ def _infer_request_host(req) -> str:
     return host
 
 
+def _parse_trusted_proxies(value: str):
+    networks = []
+    for entry in value.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        try:
+            networks.append(ipaddress.ip_network(entry, strict=False))
+        except ValueError:
+            print(f"Ignoring invalid WEBUI_TRUSTED_PROXIES entry: {entry}")
+    return tuple(networks)
+
+
+_trusted_proxies = _parse_trusted_proxies(TRUSTED_PROXIES)
+
+
+@lru_cache(maxsize=1024)
+def _is_trusted_proxy(address: str) -> bool:
+    try:
+        parsed = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(parsed in network for network in _trusted_proxies)
+
+
+def _infer_client_address(environ) -> str:
+    """Address the failed-login throttle is keyed on, from a WSGI environ.
+
+    Walks the ``X-Forwarded-For`` chain from the right, starting at the TCP peer, past
+    every hop in ``WEBUI_TRUSTED_PROXIES``; the first untrusted hop is the client.
+    Entries left of it were written by the client and are ignored. ``X-Real-IP`` is only
+    used when a trusted peer sent no ``X-Forwarded-For``.
+    """
+    remote_addr = environ.get("REMOTE_ADDR") or "unknown"
+    if not _is_trusted_proxy(remote_addr):
+        return remote_addr
+    forwarded = [entry.strip() for entry in (environ.get("HTTP_X_FORWARDED_FOR") or "").split(",")]
+    forwarded = [entry for entry in forwarded if entry]
+    if not forwarded:
+        return (environ.get("HTTP_X_REAL_IP") or "").strip() or remote_addr
+    client = remote_addr
+    for hop in reversed(forwarded):
+        client = hop
+        if not _is_trusted_proxy(hop):
+            break
+    return client
+
+
+class _ThrottledClientFilter:
+    """WSGI wrapper that answers throttled clients with 429 before Flask builds a request.
+
+    Keeps the per-request cost of a bad-credential flood to a dict lookup, so it
+    competes as little as possible with legitimate dashboard requests.
+    """
+
+    _BODY = b"Too many failed login attempts"
+
+    def __init__(self, wsgi_app):
+        self.wsgi_app = wsgi_app
+
+    def __call__(self, environ, start_response):
+        path = environ.get("PATH_INFO", "")
+        exempt = path in PUBLIC_PATHS or (
+            # nginx auth_request subrequest; /internal/ is not proxied from the public port.
+            path == "/internal/display/wake" and _is_loopback(environ.get("REMOTE_ADDR"))
+        )
+        if not exempt:
+            retry_after = _auth_throttle.retry_after(_infer_client_address(environ))
+            if retry_after is not None:
+                start_response("429 Too Many Requests", [
+                    ("Content-Type", "text/plain; charset=utf-8"),
+                    ("Content-Length", str(len(self._BODY))),
+                    ("Retry-After", str(max(1, int(retry_after + 0.999)))),
+                ])
+                return [self._BODY]
+        return self.wsgi_app(environ, start_response)
+
+
 def _build_novnc_urls(req) -> Tuple[Optional[str], Optional[str]]:
     base = (NOVNC_PUBLIC_URL or "").strip()
     if base:
@@ -229,6 +408,10 @@ def _rotate_novnc_realm() -> Optional[str]:
         return None
 
 
+def _is_loopback(address: Optional[str]) -> bool:
+    return address in {"127.0.0.1", "::1", "localhost"}
+
+
 def _restart_novnc_services() -> bool:
     """Restart supervisor-managed services backing the remote desktop."""
     restarted = False
@@ -249,13 +432,25 @@ def _restart_novnc_services() -> bool:
 @app.before_request
 def require_basic_auth():
     """Enforce HTTP Basic Auth when credentials are configured"""
-    if request.path == '/logout':
+    if request.path in PUBLIC_PATHS:
+        return None
+    if request.path == '/internal/display/wake' and _is_loopback(request.remote_addr):
+        # nginx auth_request subrequest; /internal/ is not proxied from the public port.
         return None
-    username, password = _get_webui_credentials()
+    global _auth_enforced  # pylint: disable=global-statement
+    # Throttled clients were already answered by _ThrottledClientFilter.
+    client = _infer_client_address(request.environ)
+    auth = request.authorization
+    if not auth and _auth_enforced:
+        _auth_throttle.record_fast_rejection()
+        return _auth_required_response()
+    username, password = _get_webui_credentials(_request_auth_config())
+    _auth_enforced = bool(username and password)
     if username and password:
-        auth = request.authorization
         if not auth or auth.username != username or auth.password != password:
+            _auth_throttle.record_failure(client)
             return _auth_required_response()
+        _auth_throttle.record_success(client)
 
 
 def read_config():
@@ -266,14 +461,18 @@ def read_config():
     return {}
 
 
-def write_config(config_data, restart: bool = True):
-    """Write Triplo configuration and optionally reload the app"""
+def write_config(config_data, restart: bool = True) -> Optional[bool]:
+    """Write Triplo configuration and optionally reload the app.
+
+    Returns whether Triplo is running after the restart, or ``None`` without one.
+    """
     CONFIG_PATH.parent.mkdir(parents=True, exist_ok=True)
     with open(CONFIG_PATH, 'w') as f:
         json.dump(config_data, f, indent=2)
 
     if restart:
-        restart_triplo()
+        return restart_triplo()
+    return None
 
 
 def restart_triplo():
@@ -344,10 +543,13 @@ def update_config():
     """Update configuration"""
     try:
         new_config = request.json
-        write_config(new_config)
+        started = time.perf_counter()
+        running = write_config(new_config)
         return jsonify({
             'success': True,
-            'message': 'Configuration updated and Triplo restarted'
+            'message': 'Configuration updated and Triplo restarted',
+            'running': running,
+            'restart_ms': round((time.perf_counter() - started) * 1000, 3)
         })
     except Exception as e:
         return jsonify({
@@ -356,9 +558,8 @@ def update_config():
         }), 500
 
 
-@app.route('/api/status', methods=['GET'])
-def get_status():
-    """Get Triplo AI status"""
+def _status_payload(platform: Optional[Dict] = None) -> Dict:
+    """Build the /api/status body; ``platform`` avoids re-reading platform settings."""
     try:
         result = subprocess.run(
             ["pgrep", "-f", "triplo.ai"],
@@ -366,15 +567,15 @@ def get_status():
             text=True
         )
         running = bool(result.stdout.strip())
-        platform = _load_platform_settings()
+        platform = platform if platform is not None else _load_platform_settings()
         novnc_active = os.environ.get('ENABLE_NOVNC', 'false').lower() == 'true'
         novnc_configured = platform.get('novnc_enabled', novnc_active)
         novnc_url = None
         novnc_logout = None
         if novnc_active or novnc_configured:
             novnc_url, novnc_logout = _build_novnc_urls(request)
-        
-        return jsonify({
+
+        return {
             'running': running,
             'novnc_enabled': novnc_active,
             'novnc': {
@@ -384,12 +585,66 @@ def get_status():
                 'url': novnc_url,
                 'logout_url': novnc_logout
             }
-        })
+        }
     except Exception as e:
-        return jsonify({
+        return {
             'running': False,
             'error': str(e)
-        })
+        }
+
+
+def _display_payload(platform: Optional[Dict] = None) -> Dict:
+    platform = platform if platform is not None else _load_platform_settings()
+    configured = display_stack.normalize_display_settings(platform)
+    active = _active_display_settings()
+    return {
+        'configured': configured,
+        'active': active,
+        'requires_restart': configured != active
+    }
+
+
+def _auth_payload(config: Dict) -> Dict:
+    """Auth settings safe to return to the browser (no passwords)."""
+    return {
+        'webui': {
+            'username': config['webui'].get('username', '')
+        },
+        'novnc': {
+            'use_webui_credentials': config['novnc'].get('use_webui_credentials', True),
+            'username': config['novnc'].get('username', '')
+        }
+    }
+
+
+@app.route('/api/status', methods=['GET'])
+def get_status():
+    """Get Triplo AI status"""
+    return jsonify(_status_payload())
+
+
+@app.route('/api/bootstrap', methods=['GET'])
+def get_bootstrap():
+    """Return everything the dashboard needs on page load in a single response."""
+    platform = _load_platform_settings()
+    try:
+        config = read_config()
+        config_error = None
+    except (OSError, json.JSONDecodeError) as exc:
+        config = {}
+        config_error = str(exc)
+    payload = {
+        'config': config,
+        'status': _status_payload(platform),
+        'auth': _auth_payload(_request_auth_config()),
+        'platform': {
+            'novnc_enabled': platform['novnc_enabled'],
+            'display': _display_payload(platform)
+        }
+    }
+    if config_error:
+        payload['config_error'] = config_error
+    return jsonify(payload)
 
 
 @app.route('/api/platform/novnc', methods=['POST'])
@@ -416,6 +671,59 @@ def update_novnc_setting():
         return jsonify({'success': False, 'message': str(exc)}), 500
 
 
+@app.route('/api/platform/display', methods=['GET'])
+def get_display_settings():
+    """Report configured vs. active remote desktop resource profile."""
+    return jsonify(_display_payload())
+
+
+@app.route('/api/platform/display', methods=['POST'])
+def update_display_settings():
+    """Persist the remote desktop resource profile (always-on vs. on-demand)."""
+    try:
+        payload = request.json or {}
+        platform = _load_platform_settings()
+        for key in display_stack.DEFAULT_DISPLAY_SETTINGS:
+            if key in payload:
+                platform[key] = payload[key]
+        if str(platform.get('display_mode', '')).strip().lower() not in display_stack.DISPLAY_MODES:
+            return jsonify({'success': False, 'message': 'display_mode must be one of: ' + ', '.join(display_stack.DISPLAY_MODES)}), 400
+        platform.update(display_stack.normalize_display_settings(platform))
+        _save_platform_settings(platform)
+
+        configured = display_stack.normalize_display_settings(platform)
+        active = _active_display_settings()
+        requires_restart = configured != active
+        return jsonify({
+            'success': True,
+            'configured': configured,
+            'active': active,
+            'requires_restart': requires_restart,
+            'message': 'Setting saved. Restart the container to apply the change.' if requires_restart else 'Setting applied.'
+        })
+    except Exception as exc:
+        return jsonify({'success': False, 'message': str(exc)}), 500
+
+
+@app.route('/api/platform/memory', methods=['GET'])
+def get_program_memory():
+    """Report resident memory per supervisor-managed program."""
+    try:
+        return jsonify(display_stack.memory_report())
+    except Exception as exc:
+        return jsonify({'programs': {}, 'total_rss_kb': 0, 'error': str(exc)}), 500
+
+
+@app.route('/internal/display/wake', methods=['GET'])
+def wake_display_stack():
+    """Start x11vnc/noVNC on demand before nginx proxies a /websockify connection."""
+    if _active_display_settings()['display_mode'] != 'on_demand':
+        return Response(status=204)
+    if display_stack.start_programs():
+        return Response(status=204)
+    return Response("Remote desktop unavailable", 503)
+
+
 @app.route('/api/local-llm/key', methods=['POST'])
 def regenerate_llm_key():
     """Generate a new Local LLM encryption key."""
@@ -445,27 +753,236 @@ def fetch_local_llm_models():
         models = _fetch_local_llm_models(url)
         persist = _normalize_bool(payload.get('persist', False))
         if persist:
+            # Only the models the user picked belong in config.json; the catalog stays in the index.
+            selected = payload.get('selected')
+            if not isinstance(selected, list):
+                return jsonify({'success': False, 'message': 'persist requires a list of selected models'}), 400
             config = read_config() or {}
-            config.setdefault('settings', {})['ollama_models'] = models
+            config.setdefault('settings', {})['ollama_models'] = [
+                name for name in dict.fromkeys(str(item).strip() for item in selected) if name
+            ]
             write_config(config, restart=False)
         return jsonify({'success': True, 'models': models, 'persisted': persist})
     except Exception as exc:
         return jsonify({'success': False, 'message': str(exc)}), 400
 
 
+def _bounded_int(value, default: int, minimum: int, maximum: Optional[int] = None) -> int:
+    try:
+        value = int(value if value is not None else default)
+    except (TypeError, ValueError):
+        value = default
+    value = max(minimum, value)
+    return min(value, maximum) if maximum is not None else value
+
+
+def _query_int(name: str, default: int, minimum: int, maximum: Optional[int] = None) -> int:
+    return _bounded_int(request.args.get(name), default, minimum, maximum)
+
+
+def _saved_ollama_url() -> str:
+    try:
+        return ((read_config() or {}).get('settings') or {}).get('ollama_url') or ''
+    except (OSError, json.JSONDecodeError):
+        return ''
+
+
+def _model_search_page(index: ModelIndex, params) -> Dict:
+    result = index.search(
+        params.get('q') or '',
+        provider=params.get('provider'),
+        family=params.get('family'),
+        offset=_bounded_int(params.get('offset'), 0, 0),
+        limit=_bounded_int(params.get('limit'), 50, 1, MODEL_SEARCH_MAX_LIMIT),
+    )
+    result.update({
+        'success': True,
+        'source': index.source,
+        'catalog_size': len(index),
+        'indexed_at': index.built_at,
+    })
+    return result
+
+
+@app.route('/api/models/search', methods=['GET'])
+def search_models():
+    """Search an already indexed provider model catalog one page at a time.
+
+    ``url`` defaults to the configured Ollama URL, whose index is rebuilt here when it has
+    expired. Any other URL must have been indexed through ``POST /api/models/search``:
+    a GET can be triggered cross-site, so it never makes the server fetch a caller-chosen URL.
+    """
+    saved_url = _saved_ollama_url()
+    url = (request.args.get('url') or '').strip() or saved_url
+    if not url:
+        return jsonify({'success': False, 'message': 'Local LLM provider URL is required'}), 400
+    cleaned = _normalize_provider_url(url)
+    index = _model_indexes.get(cleaned)
+    if index is None:
+        if not saved_url or cleaned != _normalize_provider_url(saved_url):
+            return jsonify({'success': False, 'message': 'Catalog not indexed; refresh it from the provider first'}), 404
+        try:
+            index = _get_model_index(cleaned)
+        except Exception as exc:
+            return jsonify({'success': False, 'message': str(exc)}), 502
+    return jsonify(_model_search_page(index, request.args))
+
+
+@app.route('/api/models/search', methods=['POST'])
+def refresh_model_search():
+    """Re-fetch a provider catalog into the index and return the first page of matches.
+
+    Takes the same fields as the GET as a JSON body.
+    """
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, dict):
+        return jsonify({'success': False, 'message': 'Expected a JSON body'}), 400
+    url = (payload.get('url') or '').strip() or _saved_ollama_url()
+    if not url:
+        return jsonify({'success': False, 'message': 'Local LLM provider URL is required'}), 400
+    try:
+        index = _get_model_index(url, refresh=True)
+    except Exception as exc:
+        return jsonify({'success': False, 'message': str(exc)}), 502
+    return jsonify(_model_search_page(index, payload))
+
+
+@app.route('/api/providers/benchmark', methods=['GET'])
+def get_provider_benchmarks():
+    """Return the rolling history of provider benchmark runs (oldest first)."""
+    return jsonify({'success': True, 'runs': _provider_history.load()})
+
+
+@app.route('/api/providers/benchmark', methods=['POST'])
+def run_provider_benchmark():
+    """Time small streaming completions against every enabled provider in config.json."""
+    payload = request.json or {}
+    requests_per_provider = _bounded_int(payload.get('requests'), 3, 1, 20)
+    parallelism = _bounded_int(payload.get('parallelism'), 4, 1, 16)
+    max_tokens = _bounded_int(payload.get('max_tokens'), 16, 1, 256)
+    try:
+        settings = (read_config() or {}).get('settings') or {}
+        targets = provider_bench.enabled_providers(settings, _normalize_provider_url)
+    except (OSError, json.JSONDecodeError, ValueError) as exc:
+        return jsonify({'success': False, 'message': str(exc)}), 400
+
+    wanted = payload.get('providers')
+    if isinstance(wanted, list):
+        targets = [target for target in targets if target['provider'] in wanted]
+    if not targets:
+        return jsonify({'success': False, 'message': 'No enabled providers to benchmark'}), 400
+
+    waves = -(-requests_per_provider * len(targets) // parallelism)
+    timeout = min(PROVIDER_BENCHMARK_TIMEOUT, PROVIDER_BENCHMARK_BUDGET / waves)
+    if timeout < 1:
+        return jsonify({
+            'success': False,
+            'message': 'Too many requests for this parallelism; raise parallelism or lower requests'
+        }), 400
+
+    run = provider_bench.run_benchmark(targets, requests_per_provider, parallelism, max_tokens, timeout)
+    try:
+        _provider_history.append(run)
+    except OSError as exc:
+        print(f"Failed to record provider benchmark: {exc}")
+    return jsonify({'success': True, 'run': run})
+
+
+@app.route('/api/fleet/peers', methods=['GET'])
+def get_fleet_peers():
+    """List registered fleet peers (without their passwords)."""
+    try:
+        peers = fleet.load_peers()
+    except (OSError, ValueError) as exc:
+        return jsonify({'success': False, 'message': str(exc)}), 500
+    return jsonify({'success': True, 'peers': [fleet.public_peer(peer) for peer in peers]})
+
+
+@app.route('/api/fleet/peers', methods=['POST'])
+def save_fleet_peer():
+    """Add a peer, or update the one with the same name (blank password keeps the stored one)."""
+    payload = request.json or {}
+    try:
+        peers = fleet.load_peers()
+        peer = fleet.normalize_peer(payload, peers)
+        peers = [item for item in peers if item['name'] != peer['name']] + [peer]
+        fleet.save_peers(peers)
+    except ValueError as exc:
+        return jsonify({'success': False, 'message': str(exc)}), 400
+    except OSError as exc:
+        return jsonify({'success': False, 'message': str(exc)}), 500
+    return jsonify({'success': True, 'peer': fleet.public_peer(peer)})
+
+
+@app.route('/api/fleet/peers/<name>', methods=['DELETE'])
+def delete_fleet_peer(name):
+    """Remove a peer from the registry; 404 if no peer has that name."""
+    try:
+        peers = fleet.load_peers()
+        remaining = [peer for peer in peers if peer['name'] != name]
+        if len(remaining) == len(peers):
+            return jsonify({'success': False, 'message': f'Unknown peer: {name}'}), 404
+        fleet.save_peers(remaining)
+    except (OSError, ValueError) as exc:
+        return jsonify({'success': False, 'message': str(exc)}), 500
+    return jsonify({'success': True})
+
+
+@app.route('/api/fleet/status', methods=['GET'])
+def get_fleet_status():
+    """Query every peer's /api/status concurrently and return per-node and aggregate health."""
+    try:
+        peers = fleet.load_peers()
+    except (OSError, ValueError) as exc:
+        return jsonify({'success': False, 'message': str(exc)}), 500
+    result = fleet.poll_status(_fleet_client, peers, _query_int('parallelism', 8, 1, 32))
+    result['success'] = True
+    result['pool'] = _fleet_client.stats()
+    return jsonify(result)
+
+
+@app.route('/api/fleet/rollout', methods=['GET'])
+def get_fleet_rollout():
+    """Progress of the current or most recent rollout."""
+    return jsonify({'success': True, 'rollout': fleet.load_rollout()})
+
+
+@app.route('/api/fleet/rollout', methods=['POST'])
+def start_fleet_rollout():
+    """Roll a settings change out to the fleet: canary first, then parallel batches."""
+    payload = request.json or {}
+    settings = payload.get('settings')
+    if not isinstance(settings, dict):
+        return jsonify({'success': False, 'message': 'settings must be an object'}), 400
+    try:
+        rollout = fleet.Rollout(
+            _fleet_client,
+            fleet.load_peers(),
+            settings,
+            canary=payload.get('canary') or None,
+            batch_size=_bounded_int(payload.get('batch_size'), 2, 1, 32),
+            max_failures=_bounded_int(payload.get('max_failures'), 0, 0),
+        )
+        state = rollout.start()
+    except ValueError as exc:
+        return jsonify({'success': False, 'message': str(exc)}), 400
+    except RuntimeError as exc:
+        return jsonify({'success': False, 'message': str(exc)}), 409
+    return jsonify({'success': True, 'rollout': state}), 202
+
+
 @app.route('/api/auth', methods=['GET'])
 def get_auth():
     """Return web UI / noVNC authentication settings (without passwords)."""
-    config = _load_auth_config()
-    return jsonify({
-        'webui': {
-            'username': config['webui'].get('username', '')
-        },
-        'novnc': {
-            'use_webui_credentials': config['novnc'].get('use_webui_credentials', True),
-            'username': config['novnc'].get('username', '')
-        }
-    })
+    return jsonify(_auth_payload(_request_auth_config()))
+
+
+@app.route('/api/auth/throttle', methods=['GET'])
+def get_auth_throttle_stats():
+    """Report failed-login counters for this worker process."""
+    stats = _auth_throttle.stats()
+    stats['worker_pid'] = os.getpid()
+    return jsonify(stats)
 
 
 @app.route('/api/auth', methods=['POST'])
@@ -473,7 +990,7 @@ def update_auth():
     """Update authentication configuration for Web UI and noVNC."""
     try:
         payload = request.json or {}
-        current = _load_auth_config()
+        current = _request_auth_config()
 
         webui_payload = payload.get('webui', {})
         novnc_payload = payload.get('novnc', {})
@@ -572,6 +1089,80 @@ def logout_novnc():
     })
 
 
+@app.route('/healthz', methods=['GET'])
+def healthz():
+    """Liveness probe: the Web UI process is serving requests."""
+    return jsonify({'status': 'ok'})
+
+
+@app.route('/readyz', methods=['GET'])
+def readyz():
+    """Readiness probe answered from the background health snapshot."""
+    snapshot = _health_monitor.snapshot()
+    return jsonify(snapshot), 200 if snapshot['ready'] else 503
+
+
+@app.after_request
+def record_first_response(response):
+    """Remember how long this worker took to serve its first request."""
+    if _startup['first_response_ms'] is None:
+        started = _startup['worker_started'] or _IMPORT_STARTED
+        _startup['first_response_ms'] = round((time.perf_counter() - started) * 1000, 3)
+    return response
+
+
+@app.route('/api/startup', methods=['GET'])
+def get_startup_report():
+    """Report one-time initialization cost and this worker's time to first response."""
+    report = dict(_startup)
+    report['worker_pid'] = os.getpid()
+    report.pop('worker_started', None)
+    return jsonify(report)
+
+
+def warm_caches() -> Dict[str, float]:
+    """Do one-time initialization before serving; under ``--preload`` this runs in the master.
+
+    Only reads existing files so importing the app never creates auth state.
+    """
+    phases = _startup['phases_ms']
+
+    def timed(name, func):
+        started = time.perf_counter()
+        try:
+            func()
+        except Exception as exc:  # pylint: disable=broad-except
+            print(f"Warm-up step {name} failed: {exc}")
+        phases[name] = round((time.perf_counter() - started) * 1000, 3)
+
+    if auth_storage.AUTH_KEY_PATH.exists():
+        timed('auth_key', auth_storage._load_key)  # pylint: disable=protected-access
+    timed('templates', lambda: app.jinja_env.get_template('index.html'))
+    timed('config', read_config)
+    timed('platform_settings', _load_platform_settings)
+    if auth_storage.AUTH_CONFIG_PATH.exists():
+        timed('auth_decrypt', _load_auth_config)
+    return phases
+
+
+def mark_worker_started(preloaded: bool, forked_at: Optional[float] = None) -> None:
+    """Called from gunicorn worker hooks so time-to-first-response starts at the fork."""
+    _startup['pid'] = os.getpid()
+    _startup['preloaded'] = preloaded
+    _startup['worker_started'] = forked_at if forked_at is not None else time.perf_counter()
+    _startup['first_response_ms'] = None
+
+
+def start_health_monitor() -> None:
+    """Called from gunicorn's post_worker_init so /readyz has a snapshot before traffic arrives."""
+    _health_monitor.ensure_started()
+
+
+def startup_report() -> str:
+    phases = ", ".join(f"{name}={ms}ms" for name, ms in _startup['phases_ms'].items())
+    return f"Web UI startup (pid {_startup['pid']}): {phases}"
+
+
 LOGOUT_HTML = """<!DOCTYPE html>\n<html lang=\"en\">\n<head>\n    <meta charset=\"utf-8\">\n    <title>Logged out</title>\n    <meta http-equiv=\"refresh\" content=\"0;url=/\">\n</head>\n<body style=\"font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif;\">\n    <p>You have been signed out. Redirecting to the login screen...</p>\n    <script>setTimeout(function(){ window.location.replace('/'); }, 50);</script>\n</body>\n</html>"""
 
 
@@ -591,6 +1182,11 @@ def logout():
     return response
 
 
+app.wsgi_app = _ThrottledClientFilter(app.wsgi_app)
+
+_startup['phases_ms']['import'] = round((time.perf_counter() - _IMPORT_STARTED) * 1000, 3)
+
+
 if __name__ == '__main__':
     # Run on port 8080
     app.run(host='0.0.0.0', port=8080, debug=False)
@@ -11,7 +11,7 @@ import secrets
 import hmac
 import hashlib
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 AUTH_CONFIG_PATH = Path(
     os.environ.get("WEBUI_AUTH_FILE", Path.home() / ".config" / "Triplo AI" / "webui-auth.json")
@@ -20,6 +20,8 @@ AUTH_KEY_PATH = Path(
     os.environ.get("WEBUI_AUTH_KEY_FILE", Path.home() / ".config" / "Triplo AI" / "webui-auth.key")
 )
 _ENVELOPE_VERSION = 1
+# (path, inode, mtime) of the key file and its decoded bytes, so repeated loads skip disk reads.
+_key_cache: Optional[Tuple[Tuple[Any, ...], bytes]] = None
 
 
 def _ensure_parent(path: Path) -> None:
@@ -27,6 +29,7 @@ def _ensure_parent(path: Path) -> None:
 
 
 def _load_key() -> bytes:
+    global _key_cache  # pylint: disable=global-statement
     _ensure_parent(AUTH_KEY_PATH)
     if not AUTH_KEY_PATH.exists():
         key_bytes = secrets.token_bytes(32)
@@ -37,6 +40,11 @@ def _load_key() -> bytes:
             pass
         return key_bytes
 
+    stat = AUTH_KEY_PATH.stat()
+    signature = (str(AUTH_KEY_PATH), stat.st_ino, stat.st_mtime_ns)
+    if _key_cache is not None and _key_cache[0] == signature:
+        return _key_cache[1]
+
     raw = AUTH_KEY_PATH.read_bytes()
     try:
         key_bytes = base64.b64decode(raw, validate=True)
@@ -44,6 +52,7 @@ def _load_key() -> bytes:
         raise ValueError("Invalid auth key file format")
     if len(key_bytes) < 32:
         raise ValueError("Auth key must be at least 32 bytes")
+    _key_cache = (signature, key_bytes[:32])
     return key_bytes[:32]
 
 
@@ -98,20 +107,34 @@ def _decrypt_payload(payload: Dict[str, Any], key: bytes) -> bytes:
     return plaintext
 
 
-def save_auth_config(config: Dict[str, Any]) -> None:
-    """Persist the provided configuration with encryption."""
+def save_encrypted_json(path: Path, data: Any) -> None:
+    """Encrypt ``data`` with the Web UI key and write it to ``path`` (mode 0600)."""
     key = _load_key()
-    _ensure_parent(AUTH_CONFIG_PATH)
-    plaintext = json.dumps(config).encode("utf-8")
+    _ensure_parent(path)
+    plaintext = json.dumps(data).encode("utf-8")
     envelope = _encrypt_payload(plaintext, key)
-    with open(AUTH_CONFIG_PATH, "w", encoding="utf-8") as auth_file:
-        json.dump(envelope, auth_file, indent=2)
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(envelope, handle, indent=2)
     try:
-        os.chmod(AUTH_CONFIG_PATH, 0o600)
+        os.chmod(path, 0o600)
     except PermissionError:
         pass
 
 
+def load_encrypted_json(path: Path) -> Any:
+    """Read and decrypt a file written by :func:`save_encrypted_json`."""
+    with open(path, "r", encoding="utf-8") as handle:
+        payload = json.load(handle)
+    if not isinstance(payload, dict) or "ciphertext" not in payload:
+        raise ValueError(f"{path} is not an encrypted envelope")
+    return json.loads(_decrypt_payload(payload, _load_key()))
+
+
+def save_auth_config(config: Dict[str, Any]) -> None:
+    """Persist the provided configuration with encryption."""
+    save_encrypted_json(AUTH_CONFIG_PATH, config)
+
+
 def _clone(obj: Dict[str, Any]) -> Dict[str, Any]:
     return json.loads(json.dumps(obj))
 
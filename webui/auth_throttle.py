@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Per-client throttling of failed Web UI authentication attempts."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+
+class FailedAuthThrottle:
+    """Token bucket per client address, drained only by failed logins.
+
+    Each client starts with ``burst`` tokens and regains ``refill_per_second``
+    tokens per second. A failed login costs one token; once a client is out of
+    tokens it is throttled until a token has been refilled, so callers can reject
+    it without decrypting the auth file. State is kept in memory per process.
+    """
+
+    def __init__(self, burst: float = 10, refill_per_second: float = 1.0, max_clients: int = 4096,
+                 clock: Callable[[], float] = time.monotonic):
+        self.burst = float(burst)
+        self.refill_per_second = float(refill_per_second)
+        self.max_clients = max_clients
+        self._clock = clock
+        self._lock = threading.Lock()
+        # client -> [tokens, last refill timestamp]; ordered by most recent failure
+        self._buckets: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._counters = {"rejected": 0, "throttled": 0, "fast_rejected": 0}
+
+    def _refill(self, bucket: List[float], now: float) -> None:
+        bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.refill_per_second)
+        bucket[1] = now
+
+    def retry_after(self, client: str) -> Optional[float]:
+        """Return seconds until ``client`` may try again, or ``None`` when it is not throttled."""
+        with self._lock:
+            bucket = self._buckets.get(client)
+            if bucket is None:
+                return None
+            self._refill(bucket, self._clock())
+            if bucket[0] >= 1:
+                return None
+            self._counters["throttled"] += 1
+            if self.refill_per_second <= 0:
+                return 60.0
+            return (1 - bucket[0]) / self.refill_per_second
+
+    def record_failure(self, client: str) -> None:
+        with self._lock:
+            now = self._clock()
+            bucket = self._buckets.get(client)
+            if bucket is None:
+                bucket = [self.burst, now]
+                self._buckets[client] = bucket
+            else:
+                self._refill(bucket, now)
+                self._buckets.move_to_end(client)
+            bucket[0] = max(0.0, bucket[0] - 1)
+            self._counters["rejected"] += 1
+            while len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+
+    def record_fast_rejection(self) -> None:
+        with self._lock:
+            self._counters["fast_rejected"] += 1
+
+    def record_success(self, client: str) -> None:
+        if client not in self._buckets:
+            return
+        with self._lock:
+            self._buckets.pop(client, None)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            data = dict(self._counters)
+            data["tracked_clients"] = len(self._buckets)
+            return data
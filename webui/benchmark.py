@@ -0,0 +1,825 @@
+#!/usr/bin/env python3
+"""Reproducible performance benchmarks for the Web UI.
+
+System dependencies (pgrep, supervisorctl, htpasswd, nginx) are replaced by
+fake binaries on PATH and the Local LLM provider by an in-process stub server,
+so results only measure the Web UI itself. Results are written as JSON and can
+be compared against an earlier run with ``--compare``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib import request as urlrequest, error as urlerror
+from urllib.parse import quote
+
+WEBUI_DIR = Path(__file__).resolve().parent
+BENCH_USER = "bench"
+BENCH_PASS = "bench-password"
+
+# Triplo is stood in for by a ``sleep`` that the fake supervisorctl starts and records in
+# $BENCH_TRIPLO_PIDFILE. The fake pgrep only reports that PID while the process still carries
+# this run's environment, so restart_triplo() never signals an unrelated process that
+# happens to reuse the PID.
+FAKE_BINARIES = {
+    "pgrep": (
+        "#!/bin/sh\n"
+        "pid=$(cat \"$BENCH_TRIPLO_PIDFILE\" 2>/dev/null) || exit 1\n"
+        "tr '\\0' '\\n' 2>/dev/null < \"/proc/$pid/environ\""
+        " | grep -qxF \"BENCH_TRIPLO_PIDFILE=$BENCH_TRIPLO_PIDFILE\" || exit 1\n"
+        "echo \"$pid\"\n"
+    ),
+    "supervisorctl": (
+        "#!/bin/sh\n"
+        "case \"$*\" in\n"
+        "  *status*)\n"
+        "    echo 'triplo                           RUNNING   pid 4242, uptime 1:00:00'\n"
+        "    echo 'webui                            RUNNING   pid 4243, uptime 1:00:00'\n"
+        "    echo 'xvfb                             RUNNING   pid 4244, uptime 1:00:00'\n"
+        "    ;;\n"
+        "  *'start triplo')\n"
+        "    old=$(pgrep -f triplo.ai) && kill \"$old\"\n"
+        "    sleep 3600 </dev/null >/dev/null 2>&1 &\n"
+        "    echo $! > \"$BENCH_TRIPLO_PIDFILE\"\n"
+        "    ;;\n"
+        "esac\n"
+        "exit 0\n"
+    ),
+    "htpasswd": "#!/bin/sh\nexit 0\n",
+    "nginx": "#!/bin/sh\nexit 0\n",
+}
+
+_fake_triplo_envs: List[Dict[str, str]] = []
+# Scenarios whose response check already failed once; later failures are only counted.
+_reported_checks = set()
+
+CRYPTO_SIZES = (64, 256, 1024, 4096, 16384, 65536)
+# OpenRouter-style vendor prefixes so catalog searches have provider facets to work with.
+STUB_VENDORS = ("openai", "anthropic", "meta-llama", "qwen", "mistralai")
+
+
+class _StubProviderHandler(BaseHTTPRequestHandler):
+    """Answers /v1/models and /api/tags like an Ollama/OpenAI-compatible provider, and streams
+    completions for /v1/chat/completions (OpenAI/OpenRouter/Ollama) and /v1/messages (Anthropic)."""
+
+    model_count = 50
+    stream_tokens = 8
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        if self.path.rstrip("/") == "/v1/models":
+            body = {"object": "list", "data": [
+                {"id": f"{STUB_VENDORS[idx % len(STUB_VENDORS)]}/stub-model-{idx}"} for idx in range(self.model_count)
+            ]}
+        elif self.path.rstrip("/") == "/api/tags":
+            body = {"models": [{"name": f"stub-model-{idx}:latest"} for idx in range(self.model_count)]}
+        else:
+            self.send_error(404)
+            return
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+        tokens = min(self.stream_tokens, int(body.get("max_tokens") or self.stream_tokens))
+        path = self.path.rstrip("/")
+        if path.endswith("/v1/chat/completions"):
+            events = [{"choices": [{"delta": {"content": f"tok{idx} "}}]} for idx in range(tokens)]
+            events.append({"choices": [], "usage": {"completion_tokens": tokens}})
+            lines = [f"data: {json.dumps(event)}\n\n" for event in events] + ["data: [DONE]\n\n"]
+        elif path.endswith("/v1/messages"):
+            events = [("message_start", {"type": "message_start"})]
+            events += [("content_block_delta", {"type": "content_block_delta", "delta": {"text": f"tok{idx} "}})
+                       for idx in range(tokens)]
+            events += [("message_delta", {"type": "message_delta", "usage": {"output_tokens": tokens}}),
+                       ("message_stop", {"type": "message_stop"})]
+            lines = [f"event: {name}\ndata: {json.dumps(event)}\n\n" for name, event in events]
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        for line in lines:
+            self.wfile.write(line.encode("utf-8"))
+            self.wfile.flush()
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        return
+
+
+def start_stub_provider(model_count: int = 50) -> Tuple[ThreadingHTTPServer, str]:
+    """Start the stub provider on a free local port and return ``(server, base_url)``."""
+    handler = type("StubProviderHandler", (_StubProviderHandler,), {"model_count": model_count})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def check_model_parser(model_count: int = 5) -> List[str]:
+    """Parse a stub model list in tiny chunks so numbers and literals straddle chunk boundaries.
+
+    Returns a description of every chunk size whose result differs from ``json.loads``.
+    """
+    sys.path.insert(0, str(WEBUI_DIR))
+    from model_index import iter_model_items  # pylint: disable=import-outside-toplevel
+
+    models = [{"id": f"stub-model-{idx}", "created": 1700000000 + idx, "score": -1.5e-3 * idx, "free": idx % 2 == 0,
+               "owned_by": None} for idx in range(model_count)]
+    payload = json.dumps({"object": "list", "created": 12.5, "total": 1e3, "data": models}).encode("utf-8")
+    failures = []
+    for chunk_size in range(1, 8):
+        try:
+            parsed = list(iter_model_items(BytesIO(payload), chunk_size=chunk_size))
+        except ValueError as exc:
+            failures.append(f"chunk_size={chunk_size}: {exc}")
+            continue
+        if parsed != models:
+            failures.append(f"chunk_size={chunk_size}: parsed {len(parsed)} items that differ from the payload")
+    return failures
+
+
+def prepare_environment(root: Path) -> Dict[str, str]:
+    """Create fake binaries and isolated config paths under ``root``; return the env to use."""
+    bin_dir = root / "bin"
+    bin_dir.mkdir(parents=True, exist_ok=True)
+    for name, body in FAKE_BINARIES.items():
+        target = bin_dir / name
+        target.write_text(body, encoding="utf-8")
+        target.chmod(0o755)
+
+    home = root / "home"
+    config_dir = home / ".config" / "Triplo AI"
+    config_dir.mkdir(parents=True, exist_ok=True)
+    env = dict(os.environ)
+    env.update({
+        "HOME": str(home),
+        "PATH": f"{bin_dir}{os.pathsep}{env.get('PATH', '')}",
+        "WEBUI_AUTH_FILE": str(config_dir / "webui-auth.json"),
+        "WEBUI_AUTH_KEY_FILE": str(config_dir / "webui-auth.key"),
+        "PLATFORM_SETTINGS_FILE": str(config_dir / "platform-settings.json"),
+        "NOVNC_HTPASSWD_PATH": str(root / "htpasswd-novnc"),
+        "ENABLE_NOVNC": "false",
+        "BENCH_TRIPLO_PIDFILE": str(root / "triplo.pid"),
+    })
+    env.pop("NOVNC_AUTH_SNIPPET_PATH", None)
+    subprocess.run([str(bin_dir / "supervisorctl"), "start", "triplo"], env=env, check=True)
+    _fake_triplo_envs.append(env)
+    return env
+
+
+def stop_fake_triplos() -> None:
+    """Terminate the stand-in Triplo processes started for every prepared environment."""
+    while _fake_triplo_envs:
+        env = _fake_triplo_envs.pop()
+        pgrep = Path(env["PATH"].split(os.pathsep, 1)[0]) / "pgrep"
+        pid = subprocess.run([str(pgrep)], env=env, capture_output=True, text=True, check=False).stdout.strip()
+        if pid.isdigit():
+            try:
+                os.kill(int(pid), signal.SIGTERM)
+            except OSError:
+                pass
+
+
+def _seed_state(env: Dict[str, str], provider_url: str) -> None:
+    config_path = Path(env["HOME"]) / ".config" / "Triplo AI" / "config.json"
+    config_path.write_text(json.dumps({
+        "settings": {
+            "ai_source": "ollama",
+            "enable_ollama": True,
+            "ollama_url": provider_url,
+            "llm_key": "abcd-efgh-ijkl-mnop",
+            "ollama_models": [f"stub-model-{idx}" for idx in range(10)],
+            "openai_key": "sk-bench",
+            "enable_openai_key": True,
+            "anthropic_key": "sk-ant-bench",
+            "enable_anthropic_key": True,
+        }
+    }, indent=2), encoding="utf-8")
+    subprocess.run(
+        [sys.executable, str(WEBUI_DIR / "auth_cli.py"), "set",
+         "--webui-user", BENCH_USER, "--webui-pass", BENCH_PASS,
+         "--novnc-user", BENCH_USER, "--novnc-pass", BENCH_PASS],
+        env=env,
+        check=True,
+    )
+
+
+def _auth_header(username: str = BENCH_USER, password: str = BENCH_PASS) -> Dict[str, str]:
+    token = base64.b64encode(f"{username}:{password}".encode("utf-8")).decode("ascii")
+    return {"Authorization": f"Basic {token}"}
+
+
+def _check_provider_run(body: Dict[str, Any]) -> Optional[str]:
+    """A benchmark run answers 200 even when every sample failed, so look at the samples."""
+    providers = (body.get("run") or {}).get("providers") or {}
+    if not providers:
+        return "no providers were benchmarked"
+    for name, summary in providers.items():
+        if summary["errors"]:
+            return f"{name}: {summary['errors']} failed sample(s): {summary['error_messages']}"
+        if summary["ttft_ms"]["p50"] is None:
+            return f"{name}: no time to first token recorded"
+    return None
+
+
+def build_scenarios(provider_url: str) -> List[Dict[str, Any]]:
+    """Requests exercised in every mode; ``expect`` is the status code(s) a healthy run returns."""
+    auth = _auth_header()
+    return [
+        {"name": "GET /", "method": "GET", "path": "/", "headers": auth, "expect": 200},
+        {"name": "GET /healthz", "method": "GET", "path": "/healthz", "headers": {}, "expect": 200},
+        # No Triplo process, X display or supervisor socket exists here, so readiness is 503.
+        {"name": "GET /readyz", "method": "GET", "path": "/readyz", "headers": {}, "expect": 503},
+        {"name": "GET /api/bootstrap", "method": "GET", "path": "/api/bootstrap", "headers": auth, "expect": 200},
+        {"name": "GET /api/config", "method": "GET", "path": "/api/config", "headers": auth, "expect": 200},
+        {"name": "GET /api/status", "method": "GET", "path": "/api/status", "headers": auth, "expect": 200},
+        {"name": "GET /api/auth", "method": "GET", "path": "/api/auth", "headers": auth, "expect": 200},
+        {"name": "GET /api/platform/display", "method": "GET", "path": "/api/platform/display", "headers": auth, "expect": 200},
+        {"name": "GET /api/platform/memory", "method": "GET", "path": "/api/platform/memory", "headers": auth, "expect": 200},
+        {"name": "POST /api/local-llm/key", "method": "POST", "path": "/api/local-llm/key", "headers": auth,
+         "json": {"persist": False}, "expect": 200},
+        {"name": "POST /api/local-llm/models", "method": "POST", "path": "/api/local-llm/models", "headers": auth,
+         "json": {"url": provider_url}, "expect": 200},
+        {"name": "POST /api/models/search (refresh)", "method": "POST", "path": "/api/models/search",
+         "headers": auth, "json": {"url": provider_url, "q": "model-4", "limit": 25}, "expect": 200},
+        {"name": "GET /api/models/search", "method": "GET",
+         "path": f"/api/models/search?url={quote(provider_url, safe='')}&q=model-4&limit=25", "headers": auth,
+         "expect": 200},
+        {"name": "GET /api/models/search (provider facet)", "method": "GET",
+         "path": f"/api/models/search?url={quote(provider_url, safe='')}&provider=qwen&offset=5&limit=25",
+         "headers": auth, "expect": 200},
+        {"name": "POST /api/providers/benchmark", "method": "POST", "path": "/api/providers/benchmark",
+         "headers": auth, "json": {"requests": 2, "parallelism": 4, "max_tokens": 8}, "expect": 200,
+         "check": _check_provider_run},
+        {"name": "GET /api/providers/benchmark", "method": "GET", "path": "/api/providers/benchmark",
+         "headers": auth, "expect": 200},
+        {"name": "GET /api/status (bad credentials)", "method": "GET", "path": "/api/status",
+         "headers": _auth_header(BENCH_USER, "wrong"), "expect": (401, 429)},
+    ]
+
+
+def summarize(latencies: List[float], elapsed: float, errors: int) -> Dict[str, Any]:
+    """Reduce raw per-request latencies (seconds) to throughput and percentile stats in ms."""
+    ordered = sorted(latencies)
+    count = len(ordered)
+
+    def percentile(fraction: float) -> float:
+        if not ordered:
+            return 0.0
+        index = min(count - 1, max(0, int(round(fraction * (count - 1)))))
+        return round(ordered[index] * 1000, 3)
+
+    return {
+        "requests": count,
+        "errors": errors,
+        "throughput_rps": round(count / elapsed, 2) if elapsed > 0 else 0.0,
+        "mean_ms": round(sum(ordered) / count * 1000, 3) if count else 0.0,
+        "p50_ms": percentile(0.50),
+        "p99_ms": percentile(0.99),
+        "max_ms": round(ordered[-1] * 1000, 3) if ordered else 0.0,
+    }
+
+
+def _run_timed(call: Callable[[], int], expect: Any, requests: int, concurrency: int) -> Dict[str, Any]:
+    expected = expect if isinstance(expect, tuple) else (expect,)
+    latencies: List[float] = []
+    errors = 0
+    lock = threading.Lock()
+
+    def one() -> None:
+        nonlocal errors
+        started = time.perf_counter()
+        try:
+            status = call()
+        except Exception:  # pylint: disable=broad-except
+            status = -1
+        duration = time.perf_counter() - started
+        with lock:
+            latencies.append(duration)
+            if status not in expected:
+                errors += 1
+
+    began = time.perf_counter()
+    if concurrency <= 1:
+        for _ in range(requests):
+            one()
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for _ in range(requests):
+                pool.submit(one)
+    return summarize(latencies, time.perf_counter() - began, errors)
+
+
+def bench_inprocess(env: Dict[str, str], scenarios: List[Dict[str, Any]], requests: int,
+                    warmup: int) -> Dict[str, Any]:
+    """Drive the Flask app through its test client, sequentially, in this process."""
+    os.environ.update(env)
+    sys.path.insert(0, str(WEBUI_DIR))
+    import app as webui_app  # pylint: disable=import-outside-toplevel
+
+    client = webui_app.app.test_client()
+    results = {}
+    for scenario in scenarios:
+        def call(scenario=scenario) -> int:
+            response = client.open(
+                scenario["path"],
+                method=scenario["method"],
+                headers=scenario["headers"],
+                json=scenario.get("json"),
+            )
+            return _checked_status(scenario, response.status_code, response.get_data())
+
+        for _ in range(warmup):
+            call()
+        results[scenario["name"]] = _run_timed(call, scenario["expect"], requests, 1)
+    return results
+
+
+def _wait_for_http(url: str, timeout: float, headers: Optional[Dict[str, str]] = None,
+                   interval: float = 0.1) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urlrequest.urlopen(urlrequest.Request(url, headers=headers or {}), timeout=1):
+                return True
+        except urlerror.HTTPError:
+            return True
+        except (urlerror.URLError, OSError):
+            time.sleep(interval)
+    return False
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def gunicorn_server(env: Dict[str, str], workers: int, ready_path: str = "/healthz",
+                    ready_headers: Optional[Dict[str, str]] = None,
+                    poll_interval: float = 0.1) -> Iterator[Optional[str]]:
+    """Run the app under gunicorn, as deployed in the container; yields its base URL or ``None``."""
+    gunicorn = shutil.which("gunicorn", path=env["PATH"])
+    if not gunicorn:
+        print("gunicorn not found on PATH; skipping gunicorn benchmarks", file=sys.stderr)
+        yield None
+        return
+
+    port = _free_port()
+    proc = subprocess.Popen(
+        [gunicorn, "-w", str(workers), "-b", f"127.0.0.1:{port}", "app:app"],
+        cwd=str(WEBUI_DIR),
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        if not _wait_for_http(base_url + ready_path, timeout=20, headers=ready_headers, interval=poll_interval):
+            print("gunicorn did not start; skipping gunicorn benchmarks", file=sys.stderr)
+            yield None
+        else:
+            yield base_url
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+def _checked_status(scenario: Dict[str, Any], status: int, body: bytes) -> int:
+    """Return ``status``, or 0 (never expected) when the scenario's ``check`` rejects the body."""
+    check = scenario.get("check")
+    if check is None:
+        return status
+    try:
+        problem = check(json.loads(body))
+    except ValueError as exc:
+        problem = f"invalid JSON: {exc}"
+    if problem is None:
+        return status
+    if scenario["name"] not in _reported_checks:
+        _reported_checks.add(scenario["name"])
+        print(f"{scenario['name']}: {problem}", file=sys.stderr)
+    return 0
+
+
+def _http_call(base_url: str, scenario: Dict[str, Any]) -> Callable[[], int]:
+    body = json.dumps(scenario["json"]).encode("utf-8") if "json" in scenario else None
+
+    def call() -> int:
+        headers = dict(scenario["headers"])
+        if body is not None:
+            headers["Content-Type"] = "application/json"
+        req = urlrequest.Request(base_url + scenario["path"], data=body, headers=headers,
+                                 method=scenario["method"])
+        try:
+            with urlrequest.urlopen(req, timeout=30) as response:
+                return _checked_status(scenario, response.status, response.read())
+        except urlerror.HTTPError as exc:
+            exc.read()
+            return exc.code
+
+    return call
+
+
+def bench_gunicorn(env: Dict[str, str], scenarios: List[Dict[str, Any]], requests: int, warmup: int,
+                   concurrency: int, workers: int) -> Optional[Dict[str, Any]]:
+    """Drive the app over HTTP through a real gunicorn server."""
+    with gunicorn_server(env, workers) as base_url:
+        if base_url is None:
+            return None
+        results = {}
+        for scenario in scenarios:
+            call = _http_call(base_url, scenario)
+            for _ in range(warmup):
+                call()
+            results[scenario["name"]] = _run_timed(call, scenario["expect"], requests, concurrency)
+        return results
+
+
+def _flood_worker(base_url: str, clients: int, rate: float, stop, sent, throttled) -> None:
+    """Send bad credentials from ``clients`` threads until ``stop`` is set.
+
+    The benchmark talks to gunicorn over loopback, the way nginx does in the container,
+    so each thread poses as a distinct remote client through ``X-Real-IP``. With
+    ``rate`` > 0 the threads together send that many requests per second; otherwise
+    each sends its next request as soon as the previous one is answered.
+    """
+    interval = clients / rate if rate > 0 else 0.0
+
+    def flood(index: int) -> None:
+        bad = _http_call(base_url, {
+            "method": "GET",
+            "path": "/api/status",
+            "headers": {**_auth_header(BENCH_USER, "wrong"), "X-Real-IP": f"203.0.113.{index % 250 + 1}"},
+        })
+        due = time.monotonic()
+        while not stop.is_set():
+            if interval:
+                due += interval
+                delay = due - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+            try:
+                status = bad()
+            except (urlerror.URLError, OSError):
+                continue
+            with sent.get_lock():
+                sent.value += 1
+            if status == 429:
+                with throttled.get_lock():
+                    throttled.value += 1
+
+    threads = [threading.Thread(target=flood, args=(idx,), daemon=True) for idx in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def bench_flood(env: Dict[str, str], requests: int, warmup: int, workers: int,
+                flood_clients: int, flood_rate: float = 0.0) -> Optional[Dict[str, Any]]:
+    """Measure dashboard latency while other clients hammer the app with bad credentials."""
+    dashboard = {"name": "GET /api/bootstrap", "method": "GET", "path": "/api/bootstrap",
+                 "headers": _auth_header(), "expect": 200}
+    with gunicorn_server(env, workers) as base_url:
+        if base_url is None:
+            return None
+        call = _http_call(base_url, dashboard)
+        for _ in range(warmup):
+            call()
+        results = {"GET /api/bootstrap (idle)": _run_timed(call, 200, requests, 1)}
+
+        stop = multiprocessing.Event()
+        sent = multiprocessing.Value("l", 0)
+        throttled = multiprocessing.Value("l", 0)
+        # A separate process, so flood threads do not compete with the timed client for this GIL.
+        flooder = multiprocessing.Process(target=_flood_worker, args=(base_url, flood_clients, flood_rate, stop, sent, throttled),
+                                          daemon=True)
+        flooder.start()
+        try:
+            time.sleep(0.5)
+            results["GET /api/bootstrap (during bad-credential flood)"] = _run_timed(call, 200, requests, 1)
+        finally:
+            stop.set()
+            flooder.join(timeout=10)
+        results["flood"] = {"sent": sent.value, "throttled": throttled.value, "clients": flood_clients,
+                            "rate": flood_rate or None}
+        return results
+
+
+def bench_coldstart(env: Dict[str, str], workers: int, runs: int) -> Optional[Dict[str, Any]]:
+    """Time from spawning gunicorn to the first authenticated /api/bootstrap, with and without preload."""
+    results = {}
+    for preload in (True, False):
+        samples = []
+        startup_report = None
+        for _ in range(runs):
+            started = time.perf_counter()
+            with gunicorn_server(dict(env, WEBUI_PRELOAD=str(preload).lower()), workers,
+                                 ready_path="/api/bootstrap", ready_headers=_auth_header(),
+                                 poll_interval=0.005) as base_url:
+                if base_url is None:
+                    return None
+                samples.append(time.perf_counter() - started)
+                req = urlrequest.Request(base_url + "/api/startup", headers=_auth_header())
+                with urlrequest.urlopen(req, timeout=10) as response:
+                    startup_report = json.loads(response.read())
+        stats = summarize(samples, sum(samples), 0)
+        results["preload" if preload else "no-preload"] = {
+            "runs": runs,
+            "first_response_ms": stats["p50_ms"],
+            "first_response_max_ms": stats["max_ms"],
+            "worker": startup_report,
+        }
+    return results
+
+
+def bench_fleet(env: Dict[str, str], workdir: Path, provider_url: str, peers: int, workers: int,
+                requests: int) -> Optional[Dict[str, Any]]:
+    """Run ``peers`` gunicorn instances and drive fleet status polling and a rollout from this process."""
+    with ExitStack() as stack:
+        peer_urls = []
+        for idx in range(peers):
+            peer_env = prepare_environment(workdir / f"peer-{idx}")
+            _seed_state(peer_env, provider_url)
+            base_url = stack.enter_context(gunicorn_server(peer_env, workers))
+            if base_url is None:
+                return None
+            peer_urls.append(base_url)
+
+        os.environ.update(env)
+        sys.path.insert(0, str(WEBUI_DIR))
+        import app as webui_app  # pylint: disable=import-outside-toplevel
+
+        client = webui_app.app.test_client()
+        auth = _auth_header()
+        for idx, base_url in enumerate(peer_urls):
+            response = client.post("/api/fleet/peers", headers=auth, json={
+                "name": f"peer-{idx}", "url": base_url, "username": BENCH_USER, "password": BENCH_PASS,
+            })
+            if response.status_code != 200:
+                print(f"Registering peer-{idx} failed: {response.get_json()}", file=sys.stderr)
+                return None
+
+        def poll() -> int:
+            response = client.get("/api/fleet/status", headers=auth)
+            summary = response.get_json()["summary"]
+            return response.status_code if summary["reachable"] == peers else 502
+
+        poll()
+        results: Dict[str, Any] = {f"GET /api/fleet/status ({peers} peers)": _run_timed(poll, 200, requests, 1)}
+        results["pool"] = client.get("/api/fleet/status", headers=auth).get_json()["pool"]
+
+        started = time.perf_counter()
+        response = client.post("/api/fleet/rollout", headers=auth, json={
+            "settings": {"temperature": 0.7}, "batch_size": 2,
+        })
+        if response.status_code != 202:
+            print(f"Starting rollout failed: {response.get_json()}", file=sys.stderr)
+            return None
+        rollout = response.get_json()["rollout"]
+        deadline = time.monotonic() + 300
+        while rollout["status"] == "running" and time.monotonic() < deadline:
+            time.sleep(0.2)
+            rollout = client.get("/api/fleet/rollout", headers=auth).get_json()["rollout"]
+        results["rollout"] = {
+            "status": rollout["status"],
+            "duration_ms": round((time.perf_counter() - started) * 1000, 3),
+            "nodes": {node["name"]: {key: node.get(key) for key in ("batch", "state", "restart_ms", "total_ms", "error")}
+                      for node in rollout["nodes"]},
+        }
+        return results
+
+
+def bench_crypto(env: Dict[str, str], iterations: int) -> Dict[str, Any]:
+    """Measure auth_storage envelope encrypt/decrypt cost against plaintext size."""
+    os.environ.update(env)
+    sys.path.insert(0, str(WEBUI_DIR))
+    import auth_storage  # pylint: disable=import-outside-toplevel
+
+    key = auth_storage._load_key()  # pylint: disable=protected-access
+    results = {}
+    for size in CRYPTO_SIZES:
+        plaintext = os.urandom(size)
+        envelope = auth_storage._encrypt_payload(plaintext, key)  # pylint: disable=protected-access
+
+        started = time.perf_counter()
+        for _ in range(iterations):
+            auth_storage._encrypt_payload(plaintext, key)  # pylint: disable=protected-access
+        encrypt = (time.perf_counter() - started) / iterations
+
+        started = time.perf_counter()
+        for _ in range(iterations):
+            auth_storage._decrypt_payload(envelope, key)  # pylint: disable=protected-access
+        decrypt = (time.perf_counter() - started) / iterations
+
+        results[str(size)] = {
+            "encrypt_us": round(encrypt * 1e6, 2),
+            "decrypt_us": round(decrypt * 1e6, 2),
+            "encrypt_mib_s": round(size / encrypt / (1 << 20), 2) if encrypt else 0.0,
+            "decrypt_mib_s": round(size / decrypt / (1 << 20), 2) if decrypt else 0.0,
+        }
+    return results
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=str(WEBUI_DIR),
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+    except FileNotFoundError:
+        return None
+    return result.stdout.strip() or None
+
+
+# Metrics where a larger value is an improvement; everything else is "lower is better".
+_HIGHER_IS_BETTER = {"throughput_rps", "encrypt_mib_s", "decrypt_mib_s"}
+_COMPARED_METRICS = ("throughput_rps", "p50_ms", "p99_ms", "encrypt_us", "decrypt_us", "first_response_ms")
+
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float) -> List[str]:
+    """Return human-readable regression lines where ``current`` is worse than ``baseline`` by > threshold %."""
+    regressions = []
+    for section in ("inprocess", "gunicorn", "flood", "coldstart", "fleet", "crypto"):
+        old_section = baseline.get(section) or {}
+        new_section = current.get(section) or {}
+        for name, new_stats in new_section.items():
+            old_stats = old_section.get(name)
+            if not isinstance(old_stats, dict):
+                continue
+            for metric in _COMPARED_METRICS:
+                old_value = old_stats.get(metric)
+                new_value = new_stats.get(metric)
+                if not old_value or new_value is None:
+                    continue
+                change = (new_value - old_value) / old_value * 100
+                worse = -change if metric in _HIGHER_IS_BETTER else change
+                if worse > threshold:
+                    regressions.append(
+                        f"{section} / {name} / {metric}: {old_value} -> {new_value} ({change:+.1f}%)"
+                    )
+    return regressions
+
+
+def _print_table(title: str, results: Dict[str, Any]) -> None:
+    print(f"\n{title}")
+    print(f"  {'endpoint':<50} {'rps':>9} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    for name, stats in results.items():
+        print(f"  {name:<50} {stats['throughput_rps']:>9} {stats['p50_ms']:>9} {stats['p99_ms']:>9} {stats['errors']:>7}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the Triplo Web UI with stubbed system dependencies")
+    parser.add_argument("--requests", type=int, default=200, help="Timed requests per endpoint")
+    parser.add_argument("--warmup", type=int, default=10, help="Untimed requests per endpoint before measuring")
+    parser.add_argument("--concurrency", type=int, default=4, help="Client threads for gunicorn runs")
+    parser.add_argument("--workers", type=int, default=2, help="gunicorn worker processes")
+    parser.add_argument("--crypto-iterations", type=int, default=200)
+    parser.add_argument("--models", type=int, default=50, help="Models returned by the stub provider")
+    parser.add_argument("--flood-rate", type=float, default=500,
+                        help="Total bad-credential requests per second in the flood scenario (0 = as fast as possible)")
+    parser.add_argument("--flood-clients", type=int, default=8,
+                        help="Bad-credential client threads for the flood scenario")
+    parser.add_argument("--coldstart-runs", type=int, default=3, help="gunicorn restarts per cold-start variant")
+    parser.add_argument("--fleet-peers", type=int, default=4, help="Local Web UI instances for the fleet scenario")
+    parser.add_argument("--mode", choices=("all", "inprocess", "gunicorn", "flood", "coldstart", "fleet", "crypto"),
+                        default="all")
+    parser.add_argument("--output", help="Write JSON results to this path")
+    parser.add_argument("--compare", help="Baseline JSON from an earlier run")
+    parser.add_argument("--threshold", type=float, default=10.0,
+                        help="Percent change treated as a regression with --compare")
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="triplo-webui-bench-"))
+    server, provider_url = start_stub_provider(args.models)
+    try:
+        env = prepare_environment(workdir)
+        # Hosted providers are pointed at the stub too, so provider benchmarks never leave the machine.
+        env.update({f"WEBUI_{name.upper()}_BASE_URL": provider_url for name in ("openai", "openrouter", "anthropic")})
+        _seed_state(env, provider_url)
+        scenarios = build_scenarios(provider_url)
+
+        results: Dict[str, Any] = {
+            "meta": {
+                "revision": _git_revision(),
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "requests": args.requests,
+                "concurrency": args.concurrency,
+                "workers": args.workers,
+            }
+        }
+        if args.mode in ("all", "crypto"):
+            results["crypto"] = bench_crypto(env, args.crypto_iterations)
+        if args.mode in ("all", "inprocess"):
+            parser_failures = check_model_parser()
+            for failure in parser_failures:
+                print(f"Model list parser mismatch: {failure}", file=sys.stderr)
+            if parser_failures:
+                return 1
+            results["inprocess"] = bench_inprocess(env, scenarios, args.requests, args.warmup)
+            _print_table("In-process (Flask test client, sequential)", results["inprocess"])
+        if args.mode in ("all", "gunicorn"):
+            gunicorn_results = bench_gunicorn(env, scenarios, args.requests, args.warmup,
+                                              args.concurrency, args.workers)
+            if gunicorn_results is not None:
+                results["gunicorn"] = gunicorn_results
+                _print_table(f"gunicorn ({args.workers} workers, {args.concurrency} clients)", gunicorn_results)
+        if args.mode in ("all", "flood"):
+            flood_results = bench_flood(env, args.requests, args.warmup, args.workers, args.flood_clients,
+                                        args.flood_rate)
+            if flood_results is not None:
+                flood_counts = flood_results.pop("flood")
+                results["flood"] = flood_results
+                results["meta"]["flood"] = flood_counts
+                _print_table(f"gunicorn under bad-credential flood ({args.flood_clients} clients)", flood_results)
+                print(f"  flood requests sent: {flood_counts['sent']}, throttled (429): {flood_counts['throttled']}")
+        if args.mode in ("all", "coldstart"):
+            coldstart = bench_coldstart(env, args.workers, args.coldstart_runs)
+            if coldstart is not None:
+                results["coldstart"] = coldstart
+                print("\nCold start (spawn to first authenticated /api/bootstrap)")
+                for variant, stats in coldstart.items():
+                    worker = stats["worker"] or {}
+                    print(f"  {variant:<12} p50 {stats['first_response_ms']:>9} ms   "
+                          f"worker first response {worker.get('first_response_ms')} ms   "
+                          f"warm-up {worker.get('phases_ms')}")
+        if args.mode in ("all", "fleet"):
+            fleet_results = bench_fleet(env, workdir, provider_url, args.fleet_peers, args.workers, args.requests)
+            if fleet_results is not None:
+                pool = fleet_results.pop("pool")
+                rollout = fleet_results.pop("rollout")
+                results["fleet"] = fleet_results
+                results["meta"]["fleet"] = {"pool": pool, "rollout": rollout}
+                _print_table(f"Fleet coordinator ({args.fleet_peers} local peers)", fleet_results)
+                print(f"  peer connections opened: {pool['connections_opened']}, reused: {pool['reused']}")
+                print(f"  rollout {rollout['status']} in {rollout['duration_ms']} ms")
+                for name, node in rollout["nodes"].items():
+                    print(f"    {name:<10} batch {node['batch']}  {node['state']:<8} restart {node['restart_ms']} ms"
+                          + (f"  ({node['error']})" if node["error"] else ""))
+                if rollout["status"] != "completed":
+                    print(f"Fleet rollout ended {rollout['status']}, expected completed", file=sys.stderr)
+                    return 1
+        if "crypto" in results:
+            print("\nauth_storage envelope cost")
+            print(f"  {'bytes':>8} {'encrypt us':>12} {'decrypt us':>12}")
+            for size, stats in results["crypto"].items():
+                print(f"  {size:>8} {stats['encrypt_us']:>12} {stats['decrypt_us']:>12}")
+    finally:
+        server.shutdown()
+        stop_fake_triplos()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump(results, output_file, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = compare_results(baseline, results, args.threshold)
+        if regressions:
+            print(f"\nRegressions vs {args.compare} (>{args.threshold:g}%):")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"\nNo regressions vs {args.compare} (>{args.threshold:g}%)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
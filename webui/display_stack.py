@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""Supervisor helpers for the on-demand remote desktop stack."""
+
+from __future__ import annotations
+
+import argparse
+import os
+import socket
+import subprocess
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+SUPERVISOR_SERVER_URL = os.environ.get("SUPERVISOR_SERVER_URL", "unix:///var/run/supervisor.sock")
+NOVNC_PROXY_PORT = int(os.environ.get("NOVNC_PROXY_PORT", "6081"))
+
+DISPLAY_MODES = ("always", "on_demand")
+COLOR_DEPTHS = (16, 24)
+DEFAULT_DISPLAY_SETTINGS = {
+    "display_mode": "always",
+    "display_idle_timeout": 300,
+    "display_color_depth": 24,
+}
+ON_DEMAND_PROGRAMS = ("x11vnc", "novnc")
+
+_PROC_ROOT = Path("/proc")
+_TCP_ESTABLISHED = "01"
+_TCP_LISTEN = "0A"
+
+
+def normalize_display_settings(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Return display settings from ``data`` with invalid values replaced by defaults."""
+    mode = str(data.get("display_mode", DEFAULT_DISPLAY_SETTINGS["display_mode"])).strip().lower()
+    if mode not in DISPLAY_MODES:
+        mode = DEFAULT_DISPLAY_SETTINGS["display_mode"]
+
+    try:
+        idle_timeout = int(data.get("display_idle_timeout", DEFAULT_DISPLAY_SETTINGS["display_idle_timeout"]))
+    except (TypeError, ValueError):
+        idle_timeout = DEFAULT_DISPLAY_SETTINGS["display_idle_timeout"]
+    idle_timeout = max(30, idle_timeout)
+
+    try:
+        depth = int(data.get("display_color_depth", DEFAULT_DISPLAY_SETTINGS["display_color_depth"]))
+    except (TypeError, ValueError):
+        depth = DEFAULT_DISPLAY_SETTINGS["display_color_depth"]
+    if depth not in COLOR_DEPTHS:
+        depth = DEFAULT_DISPLAY_SETTINGS["display_color_depth"]
+
+    return {
+        "display_mode": mode,
+        "display_idle_timeout": idle_timeout,
+        "display_color_depth": depth,
+    }
+
+
+def _supervisorctl(*args: str, timeout: float = 15) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        ["supervisorctl", "-s", SUPERVISOR_SERVER_URL, *args],
+        capture_output=True,
+        text=True,
+        check=False,
+        timeout=timeout,
+    )
+
+
+def program_status() -> Dict[str, Dict[str, Any]]:
+    """Parse ``supervisorctl status`` into ``{program: {"state", "pid"}}``."""
+    try:
+        result = _supervisorctl("status")
+    except (FileNotFoundError, subprocess.TimeoutExpired):
+        return {}
+    programs: Dict[str, Dict[str, Any]] = {}
+    for line in result.stdout.splitlines():
+        parts = line.split()
+        if len(parts) < 2:
+            continue
+        pid = None
+        if len(parts) >= 4 and parts[2] == "pid":
+            candidate = parts[3].rstrip(",")
+            if candidate.isdigit():
+                pid = int(candidate)
+        programs[parts[0]] = {"state": parts[1], "pid": pid}
+    return programs
+
+
+def _child_map() -> Dict[int, List[int]]:
+    children: Dict[int, List[int]] = {}
+    for entry in _PROC_ROOT.iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / "stat").read_text()
+        except OSError:
+            continue
+        # The command name may contain spaces, so split after its closing paren.
+        fields = stat.rsplit(")", 1)[-1].split()
+        if len(fields) > 1 and fields[1].isdigit():
+            children.setdefault(int(fields[1]), []).append(int(entry.name))
+    return children
+
+
+def _rss_kb(pid: int) -> int:
+    try:
+        with open(_PROC_ROOT / str(pid) / "status", "r", encoding="utf-8") as status_file:
+            for line in status_file:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except (OSError, ValueError, IndexError):
+        pass
+    return 0
+
+
+def _tree_rss_kb(pid: int, children: Dict[int, List[int]]) -> int:
+    total = 0
+    pending = [pid]
+    seen = set()
+    while pending:
+        current = pending.pop()
+        if current in seen:
+            continue
+        seen.add(current)
+        total += _rss_kb(current)
+        pending.extend(children.get(current, []))
+    return total
+
+
+def memory_report() -> Dict[str, Any]:
+    """Return resident memory (KiB) per supervised program, including child processes."""
+    programs = program_status()
+    children = _child_map() if programs else {}
+    report: Dict[str, Dict[str, Any]] = {}
+    total = 0
+    for name, info in sorted(programs.items()):
+        rss = _tree_rss_kb(info["pid"], children) if info["pid"] else 0
+        total += rss
+        report[name] = {"state": info["state"], "pid": info["pid"], "rss_kb": rss}
+    return {"programs": report, "total_rss_kb": total}
+
+
+def _count_tcp(port: int, state: str) -> int:
+    count = 0
+    for table in ("tcp", "tcp6"):
+        try:
+            with open(_PROC_ROOT / "net" / table, "r", encoding="utf-8") as tcp_file:
+                next(tcp_file, None)
+                for line in tcp_file:
+                    fields = line.split()
+                    if len(fields) < 4 or fields[3] != state:
+                        continue
+                    local_port = int(fields[1].rsplit(":", 1)[-1], 16)
+                    if local_port == port:
+                        count += 1
+        except OSError:
+            continue
+    return count
+
+
+def active_connections(port: int = NOVNC_PROXY_PORT) -> int:
+    """Count established client connections to the noVNC proxy without forking."""
+    return _count_tcp(port, _TCP_ESTABLISHED)
+
+
+def is_listening(port: int = NOVNC_PROXY_PORT) -> bool:
+    return _count_tcp(port, _TCP_LISTEN) > 0
+
+
+def _wait_for_port(port: int, timeout: float) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return True
+        except OSError:
+            time.sleep(0.1)
+    return False
+
+
+def start_programs(programs: Iterable[str] = ON_DEMAND_PROGRAMS, port: int = NOVNC_PROXY_PORT,
+                   timeout: float = 15) -> bool:
+    """Start the VNC programs if needed and wait until the proxy accepts connections."""
+    if is_listening(port):
+        return True
+    status = program_status()
+    pending = [name for name in programs if status.get(name, {}).get("state") != "RUNNING"]
+    if pending:
+        try:
+            _supervisorctl("start", *pending, timeout=timeout)
+        except (FileNotFoundError, subprocess.TimeoutExpired) as exc:
+            print(f"Failed to start remote desktop services: {exc}")
+            return False
+    return _wait_for_port(port, timeout)
+
+
+def stop_programs(programs: Iterable[str] = ON_DEMAND_PROGRAMS) -> bool:
+    try:
+        result = _supervisorctl("stop", *programs)
+    except (FileNotFoundError, subprocess.TimeoutExpired) as exc:
+        print(f"Failed to stop remote desktop services: {exc}")
+        return False
+    return result.returncode == 0
+
+
+def watch_idle(idle_timeout: int, port: int = NOVNC_PROXY_PORT, poll_interval: float = 10) -> None:
+    """Stop the VNC programs once the proxy has had no clients for ``idle_timeout`` seconds."""
+    idle_since: Optional[float] = None
+    while True:
+        if not is_listening(port) or active_connections(port):
+            idle_since = None
+        elif idle_since is None:
+            idle_since = time.monotonic()
+        elif time.monotonic() - idle_since >= idle_timeout:
+            print(f"No remote desktop clients for {idle_timeout}s; stopping {', '.join(ON_DEMAND_PROGRAMS)}")
+            stop_programs()
+            idle_since = None
+        time.sleep(poll_interval)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Manage the on-demand remote desktop stack")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    watch_parser = subparsers.add_parser("watch", help="Stop VNC services after an idle timeout")
+    watch_parser.add_argument("--idle-timeout", type=int, default=DEFAULT_DISPLAY_SETTINGS["display_idle_timeout"])
+    watch_parser.add_argument("--port", type=int, default=NOVNC_PROXY_PORT)
+    watch_parser.add_argument("--poll-interval", type=float, default=10)
+
+    subparsers.add_parser("memory", help="Print resident memory per supervised program")
+
+    args = parser.parse_args()
+
+    if args.command == "watch":
+        watch_idle(max(30, args.idle_timeout), port=args.port, poll_interval=args.poll_interval)
+        return 0
+    if args.command == "memory":
+        report = memory_report()
+        for name, info in report["programs"].items():
+            print(f"{name:<16} {info['state']:<10} {info['rss_kb']:>10} KiB")
+        print(f"{'total':<27} {report['total_rss_kb']:>10} KiB")
+        return 0
+
+    parser.error("Unknown command")
+    return 2
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
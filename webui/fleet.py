@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+"""Fleet mode: manage several Triplo Web UI instances from one of them.
+
+The registry of peers (URL plus Web UI credentials) is stored encrypted with
+the local Web UI key. Peers are reached over a small pool of keep-alive HTTP
+connections. Config rollouts go to a canary first and then to the remaining
+peers in parallel batches. Rollout progress is written to a state file so
+every gunicorn worker can report it.
+"""
+
+from __future__ import annotations
+
+import base64
+import fcntl
+import http.client
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from auth_storage import load_encrypted_json, save_encrypted_json
+
+FLEET_REGISTRY_PATH = Path(
+    os.environ.get("FLEET_REGISTRY_FILE", Path.home() / ".config" / "Triplo AI" / "fleet-peers.json")
+)
+FLEET_ROLLOUT_PATH = Path(
+    os.environ.get("FLEET_ROLLOUT_FILE", Path.home() / ".config" / "Triplo AI" / "fleet-rollout.json")
+)
+STATUS_TIMEOUT = float(os.environ.get("FLEET_STATUS_TIMEOUT", "5"))
+# A peer answers POST /api/config only after restarting Triplo, which takes several seconds.
+ROLLOUT_TIMEOUT = float(os.environ.get("FLEET_ROLLOUT_TIMEOUT", "60"))
+_RETRYABLE = (http.client.RemoteDisconnected, http.client.CannotSendRequest, BrokenPipeError, ConnectionResetError)
+
+
+def normalize_peer(data: Dict[str, Any], peers: Optional[List[Dict[str, str]]] = None) -> Dict[str, str]:
+    """Validate a peer definition.
+
+    Without a ``name`` the peer is named after its ``host:port``. A blank password keeps
+    the one stored for the peer of the same (normalized) name in ``peers``.
+    """
+    url = (data.get("url") or "").strip().rstrip("/")
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise ValueError("Peer URL must look like http://host:port")
+    try:
+        parts.port  # pylint: disable=pointless-statement
+    except ValueError as exc:
+        raise ValueError(f"Invalid peer URL: {exc}") from exc
+    name = data.get("name")
+    name = parts.netloc if name is None else str(name).strip()
+    if not name:
+        raise ValueError("Peer name must not be empty")
+    existing = next((peer for peer in peers or [] if peer["name"] == name), {})
+    password = data.get("password") or existing.get("password") or ""
+    return {
+        "name": name,
+        "url": url,
+        "username": (data.get("username") or "").strip(),
+        "password": password,
+    }
+
+
+def load_peers() -> List[Dict[str, str]]:
+    if not FLEET_REGISTRY_PATH.exists():
+        return []
+    peers = load_encrypted_json(FLEET_REGISTRY_PATH)
+    return peers if isinstance(peers, list) else []
+
+
+def save_peers(peers: List[Dict[str, str]]) -> None:
+    save_encrypted_json(FLEET_REGISTRY_PATH, peers)
+
+
+def public_peer(peer: Dict[str, str]) -> Dict[str, Any]:
+    """Peer fields safe to return to the browser (no password)."""
+    return {
+        "name": peer["name"],
+        "url": peer["url"],
+        "username": peer.get("username", ""),
+        "has_password": bool(peer.get("password")),
+    }
+
+
+class PeerClient:
+    """JSON-over-HTTP client that keeps idle keep-alive connections per peer for reuse."""
+
+    def __init__(self, max_idle_per_peer: int = 4):
+        self.max_idle_per_peer = max_idle_per_peer
+        self._lock = threading.Lock()
+        self._idle: Dict[Tuple[str, str, Optional[int]], List[http.client.HTTPConnection]] = {}
+        self._counters = {"requests": 0, "connections_opened": 0, "reused": 0}
+
+    def _acquire(self, key, timeout: float, reuse: bool = True) -> Tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            self._counters["requests"] += 1
+            idle = self._idle.get(key) if reuse else None
+            if idle:
+                self._counters["reused"] += 1
+                connection = idle.pop()
+                connection.timeout = timeout
+                if connection.sock is not None:
+                    connection.sock.settimeout(timeout)
+                return connection, True
+            self._counters["connections_opened"] += 1
+        scheme, host, port = key
+        connection_class = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        return connection_class(host, port, timeout=timeout), False
+
+    def _release(self, key, connection: http.client.HTTPConnection) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle_per_peer:
+                idle.append(connection)
+                return
+        connection.close()
+
+    def request(self, peer: Dict[str, str], method: str, path: str, payload: Any = None,
+                timeout: float = STATUS_TIMEOUT) -> Tuple[int, Any]:
+        """Send one request to ``peer`` and return ``(status, decoded JSON body or None)``.
+
+        Only GET/HEAD use pooled connections and are resent when the peer had closed one.
+        Other methods get a fresh connection and are never resent: the peer may already
+        have acted on them (``POST /api/config`` restarts Triplo).
+        """
+        parts = urlsplit(peer["url"])
+        key = (parts.scheme, parts.hostname, parts.port)
+        headers = {"Accept": "application/json"}
+        if peer.get("username") or peer.get("password"):
+            token = base64.b64encode(f"{peer.get('username', '')}:{peer.get('password', '')}".encode("utf-8"))
+            headers["Authorization"] = "Basic " + token.decode("ascii")
+        body = None
+        if payload is not None:
+            body = json.dumps(payload)
+            headers["Content-Type"] = "application/json"
+
+        idempotent = method in ("GET", "HEAD")
+        while True:
+            connection, reused = self._acquire(key, timeout, reuse=idempotent)
+            try:
+                connection.request(method, parts.path + path, body=body, headers=headers)
+                response = connection.getresponse()
+                raw = response.read()
+            except _RETRYABLE:
+                connection.close()
+                # The peer closed an idle pooled connection; retry once on a fresh one.
+                if reused:
+                    continue
+                raise
+            except Exception:
+                connection.close()
+                raise
+            if response.will_close:
+                connection.close()
+            else:
+                self._release(key, connection)
+            try:
+                data = json.loads(raw) if raw else None
+            except ValueError:
+                data = None
+            return response.status, data
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            stats = dict(self._counters)
+            stats["idle"] = sum(len(idle) for idle in self._idle.values())
+        return stats
+
+
+def _peer_status(client: PeerClient, peer: Dict[str, str]) -> Dict[str, Any]:
+    node: Dict[str, Any] = {"name": peer["name"], "url": peer["url"], "reachable": False, "running": None}
+    started = time.monotonic()
+    try:
+        status, data = client.request(peer, "GET", "/api/status")
+    except (OSError, http.client.HTTPException) as exc:
+        node["error"] = str(exc) or exc.__class__.__name__
+        return node
+    node["latency_ms"] = round((time.monotonic() - started) * 1000, 3)
+    if status != 200 or not isinstance(data, dict):
+        node["error"] = "authentication failed" if status == 401 else f"HTTP {status}"
+        return node
+    node["reachable"] = True
+    node["running"] = bool(data.get("running"))
+    if data.get("error"):
+        node["error"] = data["error"]
+    return node
+
+
+def poll_status(client: PeerClient, peers: List[Dict[str, str]], parallelism: int) -> Dict[str, Any]:
+    """Query every peer's /api/status concurrently and summarize fleet health."""
+    started = time.monotonic()
+    nodes: List[Dict[str, Any]] = []
+    if peers:
+        with ThreadPoolExecutor(max_workers=max(1, min(parallelism, len(peers)))) as executor:
+            nodes = list(executor.map(lambda peer: _peer_status(client, peer), peers))
+    reachable = sum(1 for node in nodes if node["reachable"])
+    running = sum(1 for node in nodes if node["running"])
+    return {
+        "nodes": nodes,
+        "summary": {
+            "total": len(nodes),
+            "reachable": reachable,
+            "running": running,
+            "unreachable": len(nodes) - reachable,
+            "healthy": bool(nodes) and running == len(nodes),
+        },
+        "duration_ms": round((time.monotonic() - started) * 1000, 3),
+    }
+
+
+def _read_rollout() -> Optional[Dict[str, Any]]:
+    try:
+        with open(FLEET_ROLLOUT_PATH, "r", encoding="utf-8") as handle:
+            return json.load(handle)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def _rollout_lock_path() -> str:
+    return str(FLEET_ROLLOUT_PATH) + ".lock"
+
+
+def load_rollout() -> Optional[Dict[str, Any]]:
+    """Return the last rollout state, marking a "running" one whose owner is gone as interrupted.
+
+    The worker running a rollout holds the lock file for its whole duration, so being able
+    to take the lock means the thread died with its worker (restart, OOM kill, timeout).
+    """
+    state = _read_rollout()
+    if not state or state.get("status") != "running":
+        return state
+    try:
+        lock_file = open(_rollout_lock_path(), "a", encoding="utf-8")  # pylint: disable=consider-using-with
+    except OSError:
+        return state
+    with lock_file:
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            return state
+        try:
+            # Re-read under the lock: the owner may have finished between the first read and now.
+            state = _read_rollout()
+            if state and state.get("status") == "running":
+                state["status"] = "interrupted"
+                state["finished_at"] = time.time()
+                state["error"] = f"Worker {state.get('owner_pid', '?')} exited before the rollout finished"
+                for node in state.get("nodes", []):
+                    if node.get("state") == "pending":
+                        node["state"] = "skipped"
+                    elif node.get("state") == "updating":
+                        # The peer may or may not have applied the settings.
+                        node["state"] = "unknown"
+                _save_rollout(state)
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+    return state
+
+
+def _save_rollout(state: Dict[str, Any]) -> None:
+    FLEET_ROLLOUT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=str(FLEET_ROLLOUT_PATH.parent), prefix=".fleet-rollout.")
+    with os.fdopen(fd, "w", encoding="utf-8") as handle:
+        json.dump(state, handle, indent=2)
+    os.replace(tmp_path, FLEET_ROLLOUT_PATH)
+
+
+def _apply_settings(client: PeerClient, peer: Dict[str, str], settings: Dict[str, Any], node: Dict[str, Any]) -> None:
+    """Merge ``settings`` into the peer's config.json and let it restart Triplo."""
+    started = time.monotonic()
+    status, config = client.request(peer, "GET", "/api/config")
+    if status != 200 or not isinstance(config, dict):
+        raise RuntimeError("authentication failed" if status == 401 else f"reading config: HTTP {status}")
+    config.setdefault("settings", {}).update(settings)
+    posted = time.monotonic()
+    status, result = client.request(peer, "POST", "/api/config", config, timeout=ROLLOUT_TIMEOUT)
+    finished = time.monotonic()
+    result = result if isinstance(result, dict) else {}
+    node["total_ms"] = round((finished - started) * 1000, 3)
+    # Peers report the write + restart time themselves; older ones only give us the round trip.
+    node["restart_ms"] = result.get("restart_ms", round((finished - posted) * 1000, 3))
+    if status != 200 or not result.get("success"):
+        raise RuntimeError(result.get("message") or f"writing config: HTTP {status}")
+    if result.get("running") is False:
+        raise RuntimeError("Triplo did not come back after restart")
+
+
+class Rollout:
+    """Push a settings change to a canary, then to the other peers in batches of ``batch_size``.
+
+    The rollout halts, leaving the remaining peers untouched, as soon as the canary
+    fails or more than ``max_failures`` peers have failed.
+    """
+
+    def __init__(self, client: PeerClient, peers: List[Dict[str, str]], settings: Dict[str, Any],
+                 canary: Optional[str] = None, batch_size: int = 2, max_failures: int = 0):
+        if not peers:
+            raise ValueError("No fleet peers registered")
+        if not settings:
+            raise ValueError("No settings to roll out")
+        names = [peer["name"] for peer in peers]
+        canary = canary or names[0]
+        if canary not in names:
+            raise ValueError(f"Unknown canary peer: {canary}")
+        self.client = client
+        self.settings = settings
+        self.batch_size = max(1, batch_size)
+        self.max_failures = max(0, max_failures)
+        self.canary = next(peer for peer in peers if peer["name"] == canary)
+        rest = [peer for peer in peers if peer["name"] != canary]
+        self.batches = [[self.canary]] + [rest[idx:idx + self.batch_size] for idx in range(0, len(rest), self.batch_size)]
+        self._lock = threading.Lock()
+        self._lock_file = None
+        self.state: Dict[str, Any] = {
+            "id": uuid.uuid4().hex[:12],
+            "status": "pending",
+            "started_at": None,
+            "finished_at": None,
+            "canary": canary,
+            "batch_size": self.batch_size,
+            "max_failures": self.max_failures,
+            # Only the keys: values may hold API keys and this file is not encrypted.
+            "settings_keys": sorted(settings),
+            "nodes": [
+                {"name": peer["name"], "url": peer["url"], "batch": idx, "state": "pending"}
+                for idx, batch in enumerate(self.batches) for peer in batch
+            ],
+        }
+
+    def start(self) -> Dict[str, Any]:
+        """Start the rollout in a background thread; raises ``RuntimeError`` if one is already running."""
+        FLEET_ROLLOUT_PATH.parent.mkdir(parents=True, exist_ok=True)
+        lock_file = open(_rollout_lock_path(), "a", encoding="utf-8")  # pylint: disable=consider-using-with
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError as exc:
+            lock_file.close()
+            raise RuntimeError("A fleet rollout is already in progress") from exc
+        self._lock_file = lock_file
+        self.state["status"] = "running"
+        self.state["started_at"] = time.time()
+        self.state["owner_pid"] = os.getpid()
+        _save_rollout(self.state)
+        snapshot = json.loads(json.dumps(self.state))
+        threading.Thread(target=self._run, name=f"fleet-rollout-{self.state['id']}", daemon=True).start()
+        return snapshot
+
+    def _node(self, name: str) -> Dict[str, Any]:
+        return next(node for node in self.state["nodes"] if node["name"] == name)
+
+    def _update(self, peer: Dict[str, str]) -> bool:
+        node = self._node(peer["name"])
+        with self._lock:
+            node["state"] = "updating"
+            _save_rollout(self.state)
+        result: Dict[str, Any] = {}
+        try:
+            _apply_settings(self.client, peer, self.settings, result)
+            result["state"] = "ok"
+        except (OSError, http.client.HTTPException, RuntimeError) as exc:
+            result["state"] = "failed"
+            result["error"] = str(exc) or exc.__class__.__name__
+        with self._lock:
+            node.update(result)
+            _save_rollout(self.state)
+        return result["state"] == "ok"
+
+    def _run(self) -> None:
+        failures = 0
+        try:
+            for idx, batch in enumerate(self.batches):
+                with ThreadPoolExecutor(max_workers=len(batch)) as executor:
+                    failures += sum(1 for ok in executor.map(self._update, batch) if not ok)
+                if (idx == 0 and failures) or failures > self.max_failures:
+                    for node in self.state["nodes"]:
+                        if node["state"] == "pending":
+                            node["state"] = "skipped"
+                    self.state["status"] = "halted"
+                    break
+            else:
+                self.state["status"] = "completed"
+        except Exception as exc:  # pylint: disable=broad-except
+            print(f"Fleet rollout {self.state['id']} failed: {exc}")
+            self.state["status"] = "failed"
+            self.state["error"] = str(exc)
+        finally:
+            self.state["finished_at"] = time.time()
+            self.state["failures"] = failures
+            restarts = [node["restart_ms"] for node in self.state["nodes"] if node.get("restart_ms") is not None]
+            if restarts:
+                self.state["restart_ms"] = {"max": max(restarts), "mean": round(sum(restarts) / len(restarts), 3)}
+            _save_rollout(self.state)
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+            self._lock_file.close()
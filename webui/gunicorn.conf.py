@@ -0,0 +1,39 @@
+"""gunicorn settings for the Web UI.
+
+With ``preload_app`` the master imports the app and warms its caches once
+(auth key, template compile, config parse, first decrypt) before forking, so
+workers start serving immediately. Set ``WEBUI_PRELOAD=false`` to load the
+app in each worker instead.
+"""
+
+import os
+import time
+
+workers = int(os.environ.get("WEBUI_WORKERS", "2"))
+# Threaded workers keep HTTP connections alive, which fleet coordinators reuse when polling peers.
+threads = int(os.environ.get("WEBUI_THREADS", "4"))
+keepalive = 5
+preload_app = os.environ.get("WEBUI_PRELOAD", "true").strip().lower() != "false"
+
+
+def when_ready(server):
+    if not preload_app:
+        return
+    import app  # pylint: disable=import-outside-toplevel
+
+    app.warm_caches()
+    server.log.info(app.startup_report())
+
+
+def post_fork(server, worker):  # pylint: disable=unused-argument
+    worker.triplo_forked_at = time.perf_counter()
+
+
+def post_worker_init(worker):
+    import app  # pylint: disable=import-outside-toplevel
+
+    if not preload_app:
+        app.warm_caches()
+        worker.log.info(app.startup_report())
+    app.mark_worker_started(preload_app, getattr(worker, "triplo_forked_at", None))
+    app.start_health_monitor()
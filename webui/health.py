@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""Cached readiness checks for orchestration probes.
+
+Checks only read /proc and open local sockets, so they never fork. A daemon
+thread refreshes the snapshot in the background and probe handlers just return
+the last result.
+"""
+
+from __future__ import annotations
+
+import os
+import socket
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+SUPERVISOR_SERVER_URL = os.environ.get("SUPERVISOR_SERVER_URL", "unix:///var/run/supervisor.sock")
+HEALTH_REFRESH_INTERVAL = float(os.environ.get("WEBUI_HEALTH_INTERVAL", "5"))
+TRIPLO_PROCESS_MATCH = b"triplo.ai"
+_SOCKET_TIMEOUT = 1.0
+_SUPERVISOR_PROBE_BODY = b"<?xml version='1.0'?><methodCall><methodName>supervisor.getState</methodName></methodCall>"
+_SUPERVISOR_PROBE = (
+    b"POST /RPC2 HTTP/1.0\r\n"
+    b"Content-Type: text/xml\r\n"
+    b"Content-Length: " + str(len(_SUPERVISOR_PROBE_BODY)).encode("ascii") + b"\r\n\r\n"
+    + _SUPERVISOR_PROBE_BODY
+)
+
+
+def triplo_running(proc_root: Path = Path("/proc")) -> bool:
+    """Equivalent of ``pgrep -f triplo.ai`` without spawning a process."""
+    own_pid = os.getpid()
+    for entry in proc_root.iterdir():
+        if not entry.name.isdigit() or int(entry.name) == own_pid:
+            continue
+        try:
+            cmdline = (entry / "cmdline").read_bytes()
+        except OSError:
+            continue
+        if TRIPLO_PROCESS_MATCH in cmdline:
+            return True
+    return False
+
+
+def _display_socket_path(display: Optional[str]) -> Optional[str]:
+    if not display or not display.startswith(":"):
+        return None
+    number = display[1:].split(".", 1)[0]
+    if not number.isdigit():
+        return None
+    return f"/tmp/.X11-unix/X{number}"
+
+
+def display_reachable(display: Optional[str] = None) -> bool:
+    """Check that the X server for ``display`` (default ``$DISPLAY``) accepts connections."""
+    path = _display_socket_path(display if display is not None else os.environ.get("DISPLAY"))
+    if not path:
+        return False
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(_SOCKET_TIMEOUT)
+        try:
+            sock.connect(path)
+        except OSError:
+            return False
+    return True
+
+
+def supervisor_responsive(server_url: str = SUPERVISOR_SERVER_URL) -> bool:
+    """Send a ``supervisor.getState`` XML-RPC call and expect an HTTP 200 answer."""
+    try:
+        if server_url.startswith("unix://"):
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            address: Any = server_url[len("unix://"):]
+        else:
+            host_port = server_url.split("://", 1)[-1].split("/", 1)[0]
+            host, _, port = host_port.partition(":")
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            address = (host or "127.0.0.1", int(port or 9001))
+    except ValueError:
+        return False
+    with sock:
+        sock.settimeout(_SOCKET_TIMEOUT)
+        try:
+            sock.connect(address)
+            sock.sendall(_SUPERVISOR_PROBE)
+            status_line = sock.recv(64)
+        except OSError:
+            return False
+    return status_line.startswith(b"HTTP/") and b" 200 " in status_line
+
+
+def collect_snapshot() -> Dict[str, Any]:
+    checks = {
+        "triplo": triplo_running(),
+        "display": display_reachable(),
+        "supervisor": supervisor_responsive(),
+    }
+    return {
+        "ready": all(checks.values()),
+        "checks": checks,
+        "checked_at": time.time(),
+    }
+
+
+class HealthMonitor:
+    """Keeps the latest readiness snapshot fresh from a background thread."""
+
+    def __init__(self, interval: float = HEALTH_REFRESH_INTERVAL):
+        self.interval = interval
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+        self._owner_pid: Optional[int] = None
+
+    def _refresh(self) -> None:
+        self._snapshot = collect_snapshot()
+
+    def _loop(self) -> None:
+        while True:
+            try:
+                self._refresh()
+            except Exception as exc:  # pylint: disable=broad-except
+                print(f"Health check refresh failed: {exc}")
+            time.sleep(self.interval)
+
+    def ensure_started(self) -> None:
+        """Start the refresher in this process (threads do not survive a gunicorn fork).
+
+        Returns immediately; the first snapshot is taken on the refresher thread.
+        """
+        if self._owner_pid == os.getpid():
+            return
+        with self._lock:
+            if self._owner_pid == os.getpid():
+                return
+            # A snapshot inherited through fork belongs to the parent's refresher.
+            self._snapshot = None
+            threading.Thread(target=self._loop, name="health-monitor", daemon=True).start()
+            self._owner_pid = os.getpid()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Latest snapshot, never computed inline; not ready until the first one exists."""
+        self.ensure_started()
+        snapshot = dict(self._snapshot or {"ready": False, "checks": {}, "checked_at": None})
+        if snapshot["checked_at"] is not None:
+            age = time.time() - snapshot["checked_at"]
+            snapshot["age_seconds"] = round(age, 3)
+            if age > self.interval * 3:
+                # The refresher stopped; do not keep reporting an old "ready".
+                snapshot["ready"] = False
+                snapshot["stale"] = True
+        return snapshot
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""Streaming parser and in-memory search index for provider model catalogs."""
+
+from __future__ import annotations
+
+import bisect
+import codecs
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Set
+
+MODEL_LIST_KEYS = ("models", "data", "result")
+_CHUNK_SIZE = 16 * 1024
+_WHITESPACE = " \t\r\n"
+_NUMBER_CHARS = "0123456789+-.eE"
+_TOKEN_SPLIT = re.compile(r"[-:./_\s]+")
+_decoder = json.JSONDecoder()
+
+
+class _StreamReader:
+    """Incrementally decodes a byte stream and hands out JSON values as they complete."""
+
+    def __init__(self, stream: BinaryIO, charset: str, chunk_size: int):
+        self._stream = stream
+        self._decoder = codecs.getincrementaldecoder(charset)(errors="replace")
+        self._chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self._stream.read(self._chunk_size)
+        if not chunk:
+            self.eof = True
+            self.buffer = self.buffer[self.pos:] + self._decoder.decode(b"", final=True)
+        else:
+            self.buffer = self.buffer[self.pos:] + self._decoder.decode(chunk)
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it ('' at end of input)."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise ValueError(f"Malformed model list: expected {char!r}")
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Decode one complete JSON value, reading more input until it is available."""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number is only complete once something other than a number character follows it:
+            # "12." or "1.5e" at the end of a chunk decode to a shorter number.
+            if not self.eof and isinstance(value, (int, float)) and not isinstance(value, bool):
+                stop = self.pos
+                while stop < len(self.buffer) and self.buffer[stop] in _NUMBER_CHARS:
+                    stop += 1
+                if stop == len(self.buffer):
+                    self._fill()
+                    continue
+            self.pos = end
+            return value
+
+
+def _iter_array(reader: _StreamReader) -> Iterator[Any]:
+    reader.expect("[")
+    if reader.peek() == "]":
+        reader.pos += 1
+        return
+    while True:
+        yield reader.value()
+        separator = reader.peek()
+        reader.pos += 1
+        if separator == "]":
+            return
+        if separator != ",":
+            raise ValueError("Malformed model list: expected ',' or ']'")
+
+
+def iter_model_items(stream: BinaryIO, charset: str = "utf-8", chunk_size: int = _CHUNK_SIZE) -> Iterator[Any]:
+    """Yield entries of a provider model list one at a time without loading the whole body.
+
+    Accepts a top-level array or an object whose ``models``/``data``/``result`` key holds
+    the array (Ollama ``/api/tags`` and OpenAI-style ``/v1/models``). Other keys are skipped.
+    """
+    reader = _StreamReader(stream, charset, chunk_size)
+    first = reader.peek()
+    if first == "[":
+        yield from _iter_array(reader)
+        return
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+    while True:
+        key = reader.value()
+        reader.expect(":")
+        if key in MODEL_LIST_KEYS and reader.peek() == "[":
+            yield from _iter_array(reader)
+            return
+        reader.value()
+        separator = reader.peek()
+        reader.pos += 1
+        if separator == "}":
+            return
+        if separator != ",":
+            raise ValueError("Malformed model list: expected ',' or '}'")
+
+
+def _family_from_slug(slug: str) -> str:
+    token = _TOKEN_SPLIT.split(slug.lower(), 1)[0]
+    return token.rstrip("0123456789") or token
+
+
+def model_entry(item: Any) -> Optional[Dict[str, str]]:
+    """Normalize one provider list item into ``{"name", "provider", "family"}``."""
+    if isinstance(item, str):
+        name = item.strip()
+        details: Dict[str, Any] = {}
+        owner = None
+    elif isinstance(item, dict):
+        candidate = item.get("name") or item.get("model") or item.get("id")
+        if not candidate:
+            return None
+        name = str(candidate).strip()
+        details = item.get("details") if isinstance(item.get("details"), dict) else {}
+        owner = item.get("owned_by")
+    else:
+        return None
+    if not name:
+        return None
+
+    provider, _, slug = name.rpartition("/")
+    if not provider:
+        provider = str(owner).strip().lower() if owner else "local"
+    family = str(details.get("family") or "").strip().lower() or _family_from_slug(slug)
+    return {"name": name, "provider": provider.lower(), "family": family}
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[idx:idx + 3] for idx in range(len(text) - 2)}
+
+
+class ModelIndex:
+    """Compact search index over a model catalog: trigram + token-prefix search and facets."""
+
+    def __init__(self, entries: List[Dict[str, str]], source: str = ""):
+        self.source = source
+        self.built_at = time.time()
+        self.entries: List[Dict[str, str]] = []
+        self._lower: List[str] = []
+        self._trigrams: Dict[str, List[int]] = {}
+        self._token_ids: Dict[str, List[int]] = {}
+        seen = set()
+        for entry in entries:
+            if entry["name"] in seen:
+                continue
+            seen.add(entry["name"])
+            idx = len(self.entries)
+            lowered = entry["name"].lower()
+            self.entries.append(entry)
+            self._lower.append(lowered)
+            for gram in _trigrams(lowered):
+                self._trigrams.setdefault(gram, []).append(idx)
+            for token in {tok for tok in _TOKEN_SPLIT.split(lowered) if tok}:
+                self._token_ids.setdefault(token, []).append(idx)
+        self._tokens = sorted(self._token_ids)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def names(self) -> List[str]:
+        return [entry["name"] for entry in self.entries]
+
+    def _prefix_candidates(self, query: str) -> Set[int]:
+        matches: Set[int] = set()
+        start = bisect.bisect_left(self._tokens, query)
+        for token in self._tokens[start:]:
+            if not token.startswith(query):
+                break
+            matches.update(self._token_ids[token])
+        return matches
+
+    def _candidates(self, query: str) -> List[int]:
+        if not query:
+            return list(range(len(self.entries)))
+        if len(query) < 3:
+            return list(self._prefix_candidates(query))
+        grams = sorted(_trigrams(query), key=lambda gram: len(self._trigrams.get(gram, ())))
+        candidates: Optional[Set[int]] = None
+        for gram in grams:
+            ids = self._trigrams.get(gram)
+            if not ids:
+                return []
+            candidates = set(ids) if candidates is None else candidates.intersection(ids)
+            if not candidates:
+                return []
+        return [idx for idx in candidates or () if query in self._lower[idx]]
+
+    def _rank(self, idx: int, query: str):
+        lowered = self._lower[idx]
+        slug = lowered.rpartition("/")[2]
+        if not query:
+            rank = 0
+        elif query in (lowered, slug):
+            rank = 0
+        elif lowered.startswith(query) or slug.startswith(query):
+            rank = 1
+        elif any(token.startswith(query) for token in _TOKEN_SPLIT.split(lowered)):
+            rank = 2
+        else:
+            rank = 3
+        # Shorter names first within a rank, so "llama3" sorts ahead of "llama3-70b-instruct".
+        return (rank, len(lowered) if query else 0, lowered)
+
+    def search(self, query: str = "", provider: Optional[str] = None, family: Optional[str] = None,
+               offset: int = 0, limit: int = 50) -> Dict[str, Any]:
+        """Return one page of matches plus provider/family facet counts for the query."""
+        query = (query or "").strip().lower()
+        matched = self._candidates(query)
+
+        facets: Dict[str, Dict[str, int]] = {"provider": {}, "family": {}}
+        for idx in matched:
+            entry = self.entries[idx]
+            facets["provider"][entry["provider"]] = facets["provider"].get(entry["provider"], 0) + 1
+            facets["family"][entry["family"]] = facets["family"].get(entry["family"], 0) + 1
+
+        provider = (provider or "").strip().lower()
+        family = (family or "").strip().lower()
+        filtered = [
+            idx for idx in matched
+            if (not provider or self.entries[idx]["provider"] == provider)
+            and (not family or self.entries[idx]["family"] == family)
+        ]
+        filtered.sort(key=lambda idx: self._rank(idx, query))
+        page = filtered[offset:offset + limit]
+        return {
+            "total": len(filtered),
+            "offset": offset,
+            "limit": limit,
+            "models": [self.entries[idx] for idx in page],
+            "facets": {name: dict(sorted(counts.items())) for name, counts in facets.items()},
+        }
+
+
+class ModelIndexCache:
+    """Per-process cache of built indexes keyed by provider base URL.
+
+    Holds at most ``max_indexes`` indexes; expired ones are dropped on access and the
+    least recently built one makes room for a new provider.
+    """
+
+    def __init__(self, ttl: float = 300, max_indexes: int = 8):
+        self.ttl = ttl
+        self.max_indexes = max(1, max_indexes)
+        self._lock = threading.Lock()
+        # source -> index, ordered by build time
+        self._indexes: "OrderedDict[str, ModelIndex]" = OrderedDict()
+
+    def _expire(self, now: float) -> None:
+        for source in [source for source, index in self._indexes.items() if now - index.built_at > self.ttl]:
+            del self._indexes[source]
+
+    def get(self, source: str) -> Optional[ModelIndex]:
+        with self._lock:
+            self._expire(time.time())
+            return self._indexes.get(source)
+
+    def put(self, index: ModelIndex) -> ModelIndex:
+        with self._lock:
+            self._expire(time.time())
+            self._indexes.pop(index.source, None)
+            self._indexes[index.source] = index
+            while len(self._indexes) > self.max_indexes:
+                self._indexes.popitem(last=False)
+        return index
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""Time-to-first-token benchmark for the LLM providers configured in config.json.
+
+Each sample is one small streaming completion sent over a fresh connection,
+so connect time (TCP + TLS) is measured separately from the time the
+provider takes to produce its first token.
+"""
+
+from __future__ import annotations
+
+import fcntl
+import http.client
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urlsplit
+
+BENCHMARK_PROMPT = "Reply with the numbers one to ten as words."
+DEFAULT_MODELS = {
+    "openai": "gpt-4o-mini",
+    "openrouter": "openai/gpt-4o-mini",
+    "anthropic": "claude-3-5-haiku-latest",
+}
+# Overridable so traffic can go through a proxy, or to a local stub when benchmarking the Web UI itself.
+PROVIDER_BASE_URLS = {
+    "openai": os.environ.get("WEBUI_OPENAI_BASE_URL", "https://api.openai.com"),
+    "openrouter": os.environ.get("WEBUI_OPENROUTER_BASE_URL", "https://openrouter.ai/api"),
+    "anthropic": os.environ.get("WEBUI_ANTHROPIC_BASE_URL", "https://api.anthropic.com"),
+}
+ANTHROPIC_VERSION = "2023-06-01"
+PROVIDER_NAMES = ("ollama", "openai", "openrouter", "anthropic")
+
+
+def enabled_providers(settings: Dict[str, Any], normalize_url: Callable[[str], str]) -> List[Dict[str, Any]]:
+    """Build a target per provider that has credentials/URL and is enabled or is the ``ai_source``."""
+    source = settings.get("ai_source")
+    targets = []
+
+    local_models = settings.get("ollama_models") or []
+    if settings.get("ollama_url") and (settings.get("enable_ollama") or source == "ollama"):
+        targets.append({
+            "provider": "ollama",
+            "base_url": normalize_url(settings["ollama_url"]),
+            "model": local_models[0] if local_models else None,
+            "headers": {},
+        })
+    keyed = (
+        ("openai", "openai_key", "enable_openai_key", "open_ai", settings.get("openai_model")),
+        ("openrouter", "openrouter_key", "enable_openrouter_key", "openrouter", None),
+        ("anthropic", "anthropic_key", "enable_anthropic_key", "anthropic", None),
+    )
+    for provider, key_field, enable_field, source_name, model in keyed:
+        api_key = (settings.get(key_field) or "").strip()
+        if not api_key or not (settings.get(enable_field) or source == source_name):
+            continue
+        if provider == "anthropic":
+            headers = {"x-api-key": api_key, "anthropic-version": ANTHROPIC_VERSION}
+        else:
+            headers = {"Authorization": f"Bearer {api_key}"}
+        targets.append({
+            "provider": provider,
+            "base_url": normalize_url(PROVIDER_BASE_URLS[provider]),
+            "model": model or DEFAULT_MODELS[provider],
+            "headers": headers,
+        })
+    return targets
+
+
+def _completion_request(target: Dict[str, Any], max_tokens: int):
+    messages = [{"role": "user", "content": BENCHMARK_PROMPT}]
+    body: Dict[str, Any] = {"model": target["model"], "messages": messages, "max_tokens": max_tokens, "stream": True}
+    if target["provider"] == "anthropic":
+        return "/v1/messages", body
+    # Ollama serves the same OpenAI-compatible endpoint as /v1/models.
+    body["stream_options"] = {"include_usage": True}
+    return "/v1/chat/completions", body
+
+
+def _stream_events(response, deadline: float):
+    """Yield decoded ``data:`` objects from a server-sent event stream.
+
+    Payloads that are not JSON objects (``data: "keepalive"`` and similar) carry no tokens and are skipped.
+    """
+    while True:
+        if time.monotonic() > deadline:
+            raise TimeoutError("stream exceeded the request timeout")
+        line = response.readline()
+        if not line:
+            return
+        line = line.strip()
+        if not line.startswith(b"data:"):
+            continue
+        data = line[5:].strip()
+        if data == b"[DONE]":
+            return
+        event = json.loads(data)
+        if isinstance(event, dict):
+            yield event
+
+
+def _token_update(provider: str, event: Dict[str, Any]):
+    """Return ``(has_text, reported_output_tokens)`` for one stream event."""
+    if provider == "anthropic":
+        if event.get("type") == "error":
+            raise RuntimeError((event.get("error") or {}).get("message") or "provider error")
+        if event.get("type") == "content_block_delta":
+            return bool((event.get("delta") or {}).get("text")), None
+        if event.get("type") == "message_delta":
+            return False, (event.get("usage") or {}).get("output_tokens")
+        return False, None
+    if event.get("error"):
+        error = event["error"]
+        raise RuntimeError(error.get("message") if isinstance(error, dict) else str(error))
+    reported = (event.get("usage") or {}).get("completion_tokens")
+    has_text = any((choice.get("delta") or {}).get("content") for choice in event.get("choices") or [])
+    return has_text, reported
+
+
+def measure_completion(target: Dict[str, Any], max_tokens: int, timeout: float) -> Dict[str, Any]:
+    """Send one streaming completion and time connect, first token and generation rate."""
+    sample: Dict[str, Any] = {"ok": False, "connect_ms": None, "ttft_ms": None, "tokens": 0, "tokens_per_second": None}
+    if not target.get("model"):
+        sample["error"] = "no model selected"
+        return sample
+    parts = urlsplit(target["base_url"])
+    connection_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+    path, body = _completion_request(target, max_tokens)
+    headers = {"Content-Type": "application/json", "Accept": "text/event-stream"}
+    headers.update(target["headers"])
+
+    started = time.monotonic()
+    deadline = started + timeout
+    connection = connection_class(parts.hostname, parts.port, timeout=timeout)
+    try:
+        connection.connect()
+        connected = time.monotonic()
+        sample["connect_ms"] = round((connected - started) * 1000, 3)
+        connection.request("POST", parts.path.rstrip("/") + path, body=json.dumps(body), headers=headers)
+        response = connection.getresponse()
+        if response.status != 200:
+            detail = response.read(200).decode("utf-8", "replace").strip()
+            raise RuntimeError(f"HTTP {response.status}: {detail}" if detail else f"HTTP {response.status}")
+
+        first_token = None
+        chunks = 0
+        reported = None
+        for event in _stream_events(response, deadline):
+            has_text, usage = _token_update(target["provider"], event)
+            if usage:
+                reported = usage
+            if has_text:
+                chunks += 1
+                if first_token is None:
+                    first_token = time.monotonic()
+        finished = time.monotonic()
+        if first_token is None:
+            raise RuntimeError("stream ended without any tokens")
+        sample["ttft_ms"] = round((first_token - connected) * 1000, 3)
+        sample["tokens"] = reported or chunks
+        if finished > first_token and sample["tokens"] > 1:
+            sample["tokens_per_second"] = round((sample["tokens"] - 1) / (finished - first_token), 2)
+        sample["ok"] = True
+    # AttributeError/TypeError: an event object whose fields have unexpected shapes.
+    except (OSError, http.client.HTTPException, ValueError, RuntimeError, AttributeError, TypeError) as exc:
+        sample["error"] = str(exc) or exc.__class__.__name__
+    finally:
+        connection.close()
+    return sample
+
+
+def _percentile(values: List[float], fraction: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def summarize_samples(samples: List[Dict[str, Any]]) -> Dict[str, Any]:
+    ok = [sample for sample in samples if sample["ok"]]
+    connect = [sample["connect_ms"] for sample in samples if sample["connect_ms"] is not None]
+    ttft = [sample["ttft_ms"] for sample in ok]
+    rates = [sample["tokens_per_second"] for sample in ok if sample["tokens_per_second"] is not None]
+    errors: Dict[str, int] = {}
+    for sample in samples:
+        if not sample["ok"]:
+            errors[sample["error"]] = errors.get(sample["error"], 0) + 1
+    return {
+        "requests": len(samples),
+        "errors": len(samples) - len(ok),
+        "error_rate": round((len(samples) - len(ok)) / len(samples), 3) if samples else 0.0,
+        "connect_ms": {"p50": _percentile(connect, 0.5), "max": max(connect) if connect else None},
+        "ttft_ms": {"p50": _percentile(ttft, 0.5), "p95": _percentile(ttft, 0.95), "max": max(ttft) if ttft else None},
+        "tokens_per_second": round(sum(rates) / len(rates), 2) if rates else None,
+        # Most frequent first, capped so a failing provider does not flood the response.
+        "error_messages": dict(sorted(errors.items(), key=lambda item: -item[1])[:3]),
+    }
+
+
+def run_benchmark(targets: List[Dict[str, Any]], requests_per_provider: int, parallelism: int,
+                  max_tokens: int, timeout: float) -> Dict[str, Any]:
+    """Run ``requests_per_provider`` samples per target with at most ``parallelism`` in flight."""
+    started = time.time()
+    samples: Dict[str, List[Dict[str, Any]]] = {target["provider"]: [] for target in targets}
+    jobs = [target for _ in range(requests_per_provider) for target in targets]
+    if jobs:
+        with ThreadPoolExecutor(max_workers=max(1, min(parallelism, len(jobs)))) as executor:
+            futures = [(target, executor.submit(measure_completion, target, max_tokens, timeout)) for target in jobs]
+            for target, future in futures:
+                samples[target["provider"]].append(future.result())
+    providers = {}
+    for target in targets:
+        summary = summarize_samples(samples[target["provider"]])
+        summary.update({"model": target["model"], "base_url": target["base_url"]})
+        providers[target["provider"]] = summary
+    return {
+        "started_at": started,
+        "duration_ms": round((time.time() - started) * 1000, 3),
+        "settings": {
+            "requests": requests_per_provider,
+            "parallelism": parallelism,
+            "max_tokens": max_tokens,
+            "timeout": timeout,
+        },
+        "providers": providers,
+    }
+
+
+class BenchmarkHistory:
+    """Rolling list of recent runs kept in a JSON file so every worker sees the same history."""
+
+    def __init__(self, path: Path, limit: int = 20):
+        self.path = path
+        self.limit = limit
+        self._lock = threading.Lock()
+
+    def load(self) -> List[Dict[str, Any]]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as handle:
+                runs = json.load(handle)
+        except (OSError, json.JSONDecodeError):
+            return []
+        return runs if isinstance(runs, list) else []
+
+    def append(self, run: Dict[str, Any]) -> List[Dict[str, Any]]:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # The file lock serializes the read-modify-write across gunicorn workers.
+        with self._lock, open(str(self.path) + ".lock", "a", encoding="utf-8") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                runs = (self.load() + [run])[-self.limit:]
+                fd, tmp_path = tempfile.mkstemp(dir=str(self.path.parent), prefix=".provider-benchmarks.")
+                with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                    json.dump(runs, handle)
+                os.replace(tmp_path, self.path)
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+        return runs